@@ -0,0 +1,196 @@
+import json
+import os
+from datetime import datetime
+import pandas as pd
+from modules import catalogo
+from modules.cargador import cargar_partido
+from modules.artefactos import obtener_artefacto
+from modules.conteos import estadisticas_equipo, estadisticas_por_jugador
+
+# Mes en que empieza la temporada (julio): un partido de mayo de 2025 es de la 2024-2025
+MES_INICIO_TEMPORADA = 7
+
+
+def fecha_partido(archivo):
+    """
+    Fecha del partido: la del nombre del archivo (formato YYYY-MM-DD_Rival.xlsx)
+    o, si no la tiene, la fecha de subida.
+    """
+    prefijo = os.path.basename(archivo['nombre_original']).split('_')[0]
+    try:
+        return datetime.strptime(prefijo, "%Y-%m-%d").date()
+    except ValueError:
+        return datetime.strptime(archivo['fecha_subida'], "%Y-%m-%d %H:%M:%S").date()
+
+
+def temporada_de(fecha):
+    """Temporada a la que pertenece una fecha, p. ej. '2024-2025'"""
+    inicio = fecha.year if fecha.month >= MES_INICIO_TEMPORADA else fecha.year - 1
+    return f"{inicio}-{inicio + 1}"
+
+
+def calcular_aportacion(archivo):
+    """
+    Lo que un partido suma a los totales de su equipo: estadísticas del equipo
+    y, por jugador del Valencia, sus estadísticas, minutos y partidos jugados.
+    """
+    df = cargar_partido(archivo['ruta'])
+    cubo = obtener_artefacto(df, "conteos")
+    minutos = obtener_artefacto(df, "minutos")["minutos"]
+
+    equipo = estadisticas_equipo(cubo)
+    equipo["partidos"] = 1
+
+    por_jugador = estadisticas_por_jugador(cubo)
+    por_jugador["minutos"] = minutos.reindex(por_jugador.index).fillna(0).astype("int64")
+    por_jugador["partidos"] = 1
+    jugadores = {
+        jugador: {clave: int(valor) for clave, valor in fila.items()}
+        for jugador, fila in por_jugador.iterrows()
+    }
+    return {"equipo": equipo, "jugadores": jugadores}
+
+
+def _sumar(conn, equipo, temporada, aportacion, signo):
+    """Suma (signo=1) o resta (signo=-1) la aportación de un partido a los totales"""
+    conn.executemany("""
+        INSERT INTO totales_equipo (equipo, temporada, clave, valor) VALUES (?, ?, ?, ?)
+        ON CONFLICT (equipo, temporada, clave) DO UPDATE SET valor = valor + excluded.valor
+    """, [(equipo, temporada, clave, signo * valor) for clave, valor in aportacion["equipo"].items()])
+    conn.executemany("""
+        INSERT INTO totales_jugador (equipo, temporada, jugador, clave, valor) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (equipo, temporada, jugador, clave) DO UPDATE SET valor = valor + excluded.valor
+    """, [
+        (equipo, temporada, jugador, clave, signo * valor)
+        for jugador, estadisticas in aportacion["jugadores"].items()
+        for clave, valor in estadisticas.items()
+    ])
+
+
+def anadir_partidos(archivos):
+    """
+    Suma a los totales de su equipo y temporada los partidos indicados (registros
+    del catálogo). Un partido con el mismo contenido que otro ya contado para el
+    mismo equipo se guarda sin sumarse, y uno que ya esté agregado no se vuelve a
+    sumar. Devuelve los archivos que no se pudieron procesar.
+    """
+    aportaciones = []
+    fallidos = []
+    for archivo in archivos:
+        try:
+            aportaciones.append((archivo, calcular_aportacion(archivo)))
+        except Exception as e:
+            print(f"No se pudieron calcular los agregados de {archivo['ruta']}: {e}")
+            fallidos.append(archivo)
+
+    with catalogo.conexion() as conn:
+        # Transacción de escritura desde el principio: las comprobaciones y las sumas son atómicas
+        conn.execute("BEGIN IMMEDIATE")
+        for archivo, aportacion in aportaciones:
+            # Otra sesión (p. ej. sincronizar_equipo) puede haberlo agregado mientras se calculaba
+            if conn.execute("SELECT 1 FROM agregados_partido WHERE partido_id = ?", (archivo['id'],)).fetchone():
+                continue
+            equipo = archivo['equipo']
+            temporada = temporada_de(fecha_partido(archivo))
+            ya_contado = conn.execute(
+                "SELECT 1 FROM agregados_partido WHERE equipo = ? AND hash = ? AND contado = 1 AND partido_id <> ?",
+                (equipo, archivo['hash'], archivo['id'])
+            ).fetchone()
+            conn.execute("""
+                INSERT INTO agregados_partido (partido_id, equipo, temporada, hash, contado, aportacion)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (archivo['id'], equipo, temporada, archivo['hash'], 0 if ya_contado else 1, json.dumps(aportacion)))
+            if not ya_contado:
+                _sumar(conn, equipo, temporada, aportacion, 1)
+
+    return fallidos
+
+
+def quitar_partido(archivo_id):
+    """
+    Resta de los totales un partido eliminado. Si queda otro partido del equipo
+    con el mismo contenido, pasa a contarse en su lugar.
+    """
+    with catalogo.conexion() as conn:
+        fila = conn.execute("SELECT * FROM agregados_partido WHERE partido_id = ?", (archivo_id,)).fetchone()
+        if fila is None:
+            return
+        conn.execute("DELETE FROM agregados_partido WHERE partido_id = ?", (archivo_id,))
+        if not fila['contado']:
+            return
+        _sumar(conn, fila['equipo'], fila['temporada'], json.loads(fila['aportacion']), -1)
+
+        sustituto = conn.execute(
+            "SELECT * FROM agregados_partido WHERE equipo = ? AND hash = ? ORDER BY rowid LIMIT 1",
+            (fila['equipo'], fila['hash'])
+        ).fetchone()
+        if sustituto:
+            conn.execute("UPDATE agregados_partido SET contado = 1 WHERE partido_id = ?", (sustituto['partido_id'],))
+            _sumar(conn, sustituto['equipo'], sustituto['temporada'], json.loads(sustituto['aportacion']), 1)
+
+
+def sincronizar_equipo(equipo):
+    """
+    Pone al día los agregados del equipo con el catálogo: resta los partidos que
+    ya no están en él y suma los que aún no estén agregados (subidos antes de
+    existir los agregados o cuyo cálculo falló). Devuelve los que fallen.
+    """
+    with catalogo.conexion() as conn:
+        eliminados = conn.execute("""
+            SELECT a.partido_id FROM agregados_partido a LEFT JOIN partidos p ON p.id = a.partido_id
+            WHERE a.equipo = ? AND p.id IS NULL
+        """, (equipo,)).fetchall()
+    for fila in eliminados:
+        quitar_partido(fila['partido_id'])
+
+    with catalogo.conexion() as conn:
+        filas = conn.execute("""
+            SELECT p.* FROM partidos p LEFT JOIN agregados_partido a ON a.partido_id = p.id
+            WHERE p.equipo = ? AND a.partido_id IS NULL ORDER BY p.rowid
+        """, (equipo,)).fetchall()
+    if not filas:
+        return []
+    return anadir_partidos([catalogo.obtener_archivo(fila['id']) for fila in filas])
+
+
+def temporadas_equipo(equipo):
+    """Temporadas con partidos del equipo, de la más reciente a la más antigua"""
+    with catalogo.conexion() as conn:
+        filas = conn.execute("""
+            SELECT temporada FROM totales_equipo WHERE equipo = ? AND clave = 'partidos' AND valor > 0
+            ORDER BY temporada DESC
+        """, (equipo,)).fetchall()
+    return [fila['temporada'] for fila in filas]
+
+
+def totales_equipo(equipo, temporada=None):
+    """Totales acumulados del equipo (de una temporada o de todas) y número de partidos"""
+    with catalogo.conexion() as conn:
+        if temporada:
+            filas = conn.execute(
+                "SELECT clave, valor FROM totales_equipo WHERE equipo = ? AND temporada = ?",
+                (equipo, temporada)
+            ).fetchall()
+        else:
+            filas = conn.execute(
+                "SELECT clave, SUM(valor) AS valor FROM totales_equipo WHERE equipo = ? GROUP BY clave",
+                (equipo,)
+            ).fetchall()
+    totales = {fila['clave']: fila['valor'] for fila in filas}
+    return totales, totales.pop("partidos", 0)
+
+
+def totales_jugadores(equipo, temporada=None):
+    """Totales acumulados de cada jugador del equipo: DataFrame jugador x estadística"""
+    consulta = "SELECT jugador, clave, SUM(valor) AS valor FROM totales_jugador WHERE equipo = ?"
+    parametros = [equipo]
+    if temporada:
+        consulta += " AND temporada = ?"
+        parametros.append(temporada)
+    consulta += " GROUP BY jugador, clave"
+    with catalogo.conexion() as conn:
+        filas = conn.execute(consulta, parametros).fetchall()
+    if not filas:
+        return pd.DataFrame()
+    totales = pd.DataFrame([dict(fila) for fila in filas]).pivot(index="jugador", columns="clave", values="valor")
+    return totales[totales["partidos"] > 0].fillna(0).astype("int64")
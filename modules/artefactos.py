@@ -0,0 +1,229 @@
+import os
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from modules.cargador import CacheLRU, cargar_partido, ruta_sidecar
+from modules.red_pases import calcular_redes_partido
+from modules.linea_tiempo import calcular_linea_tiempo
+from modules.minutos import calcular_tabla_minutos, minutos_de_jugador
+from modules.conteos import calcular_cubo_conteos, estadisticas_jugador
+from modules.tiros_rival import calcular_tiros_rival
+from modules.zonas import calcular_conteos_zonas
+
+# Hilos del servidor que precalculan artefactos tras una subida, configurable por entorno
+HILOS_PRECALCULO = int(os.environ.get("VCF_HILOS_PRECALCULO", "2"))
+
+# Presupuesto de memoria para los artefactos en caché (MB), configurable por entorno
+CACHE_ARTEFACTOS_MB = float(os.environ.get("VCF_CACHE_ARTEFACTOS_MB", "128"))
+
+# Cambiar la versión invalida los artefactos guardados (p. ej. al cambiar un cálculo)
+VERSION_ARTEFACTOS = 4
+
+# Cálculos registrados: nombre -> función(df) sobre la tabla de eventos completa
+_calculos = {}
+
+
+def artefacto(nombre):
+    """Registra una función como artefacto precalculable de un partido"""
+    def registrar(funcion):
+        _calculos[nombre] = funcion
+        return funcion
+    return registrar
+
+
+def _tamano_pickle(valor):
+    return len(pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+# Caché de artefactos: firma del archivo -> {nombre: valor}
+_cache_artefactos = CacheLRU(int(CACHE_ARTEFACTOS_MB * 1024 * 1024), _tamano_pickle)
+
+# Un lock por partido (firma): el precálculo y las sesiones leen, fusionan y
+# guardan sus artefactos de uno en uno, sin pisar lo que ha calculado el otro
+_locks_partido = {}
+_lock_locks = threading.Lock()
+
+# Pool de hilos del servidor (compartido por todas las sesiones)
+_pool_precalculo = ThreadPoolExecutor(max_workers=HILOS_PRECALCULO, thread_name_prefix="precalculo")
+
+
+def ruta_artefactos(ruta):
+    """Ruta del archivo de artefactos de un partido: <dir>/.cache/<nombre>.artefactos.pkl"""
+    return ruta_sidecar(ruta).replace(".parquet", ".artefactos.pkl")
+
+
+def _leer_disco(firma):
+    """Lee los artefactos guardados si corresponden a la versión actual del archivo"""
+    destino = ruta_artefactos(firma[0])
+    if not os.path.exists(destino):
+        return {}
+    try:
+        with open(destino, "rb") as f:
+            datos = pickle.load(f)
+    except Exception:
+        return {}
+    if datos.get("firma") != firma or datos.get("version") != VERSION_ARTEFACTOS:
+        return {}
+    return datos["artefactos"]
+
+
+def _escribir_disco(firma, artefactos):
+    """Guarda los artefactos del partido en disco (con el lock del partido tomado)"""
+    destino = ruta_artefactos(firma[0])
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    datos = {"firma": firma, "version": VERSION_ARTEFACTOS, "artefactos": artefactos}
+    temporal = f"{destino}.{threading.get_ident()}.tmp"
+    with open(temporal, "wb") as f:
+        pickle.dump(datos, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporal, destino)
+
+
+def _lock_partido(firma):
+    with _lock_locks:
+        return _locks_partido.setdefault(firma, threading.RLock())
+
+
+def _artefactos_partido(firma):
+    with _lock_partido(firma):
+        artefactos = _cache_artefactos.obtener(firma)
+        if artefactos is None:
+            artefactos = _leer_disco(firma)
+            _cache_artefactos.guardar(firma, artefactos)
+    return artefactos
+
+
+def _anadir_artefactos(firma, nuevos):
+    """
+    Añade artefactos recién calculados a los ya guardados en memoria del partido
+    y devuelve el conjunto. Se parte siempre de lo último guardado: un artefacto
+    puede haber calculado otros de los que depende (p. ej. minutos -> linea_tiempo).
+    """
+    with _lock_partido(firma):
+        artefactos = {**_artefactos_partido(firma), **nuevos}
+        _cache_artefactos.guardar(firma, artefactos)
+    return artefactos
+
+
+def _completar(firma, nombres):
+    """
+    Calcula los artefactos que falten y los guarda en memoria y en disco.
+    Se calculan siempre sobre el partido completo, nunca sobre un subconjunto.
+    """
+    artefactos = _artefactos_partido(firma)
+    faltan = [nombre for nombre in nombres if nombre not in artefactos]
+    if not faltan:
+        return artefactos
+
+    df = cargar_partido(firma[0])
+    if df.attrs["firma"] != firma:
+        # El archivo ha cambiado desde que se cargó: calcular con la versión nueva
+        firma = df.attrs["firma"]
+        artefactos = _artefactos_partido(firma)
+        faltan = [nombre for nombre in nombres if nombre not in artefactos]
+
+    for nombre in faltan:
+        # Puede haberlo calculado ya otro hilo o un artefacto que depende de él
+        artefactos = {**artefactos, **_artefactos_partido(firma)}
+        if nombre not in artefactos:
+            # Disponible ya para los artefactos que dependen de él
+            artefactos = _anadir_artefactos(firma, {**artefactos, nombre: _calculos[nombre](df)})
+    try:
+        with _lock_partido(firma):
+            # Se escribe lo último guardado, que incluye lo que hayan calculado otros hilos
+            artefactos = {**artefactos, **_artefactos_partido(firma)}
+            _escribir_disco(firma, artefactos)
+    except Exception as e:
+        print(f"No se pudieron guardar los artefactos de {firma[0]}: {e}")
+    return artefactos
+
+
+def obtener_artefacto(df, nombre):
+    """
+    Devuelve un artefacto del partido cargado en df: de memoria, del disco
+    o calculándolo en el momento si el precálculo aún no ha terminado.
+    """
+    firma = df.attrs.get("firma")
+    if firma is None:
+        return _calculos[nombre](df)
+    return _completar(firma, [nombre])[nombre]
+
+
+def precalcular_partido(ruta):
+    """Calcula y guarda todos los artefactos registrados de un partido"""
+    df = cargar_partido(ruta)
+    _completar(df.attrs["firma"], list(_calculos))
+
+
+def _precalcular_seguro(ruta):
+    try:
+        precalcular_partido(ruta)
+    except Exception as e:
+        print(f"Error al precalcular los artefactos de {ruta}: {e}")
+
+
+def programar_precalculo(rutas):
+    """Encola en segundo plano el precálculo de los partidos indicados"""
+    return [_pool_precalculo.submit(_precalcular_seguro, ruta) for ruta in rutas]
+
+
+def eliminar_artefactos(ruta):
+    """Borra de la caché y del disco los artefactos de un archivo eliminado"""
+    ruta_abs = os.path.abspath(ruta)
+    _cache_artefactos.eliminar_si(lambda firma: firma[0] == ruta_abs)
+    with _lock_locks:
+        for firma in [firma for firma in _locks_partido if firma[0] == ruta_abs]:
+            del _locks_partido[firma]
+    destino = ruta_artefactos(ruta_abs)
+    if os.path.exists(destino):
+        os.remove(destino)
+
+
+# =========================
+# Artefactos de un partido
+# =========================
+
+@artefacto("linea_tiempo")
+def calcular_linea_tiempo_partido(df):
+    """Periodos, cambios y apariciones de cada jugador (ver modules.linea_tiempo)"""
+    return calcular_linea_tiempo(df)
+
+
+@artefacto("minutos")
+def calcular_minutos_partido(df):
+    """Minutos jugados de cada jugador del Valencia y su origen (ver modules.minutos)"""
+    return calcular_tabla_minutos(df, obtener_artefacto(df, "linea_tiempo"))
+
+
+@artefacto("red_pases")
+def calcular_red_pases_partido(df):
+    """Red de pases del Valencia por periodo y de la 2ª Parte: {periodo: red}"""
+    return calcular_redes_partido(df)
+
+
+@artefacto("conteos")
+def calcular_conteos_partido(df):
+    """Cubo de conteos por equipo, jugador, periodo, code, group y text (ver modules.conteos)"""
+    return calcular_cubo_conteos(df)
+
+
+@artefacto("tiros_rival")
+def calcular_tiros_rival_partido(df):
+    """Finalizaciones del rival por periodo y por jugador del Valencia en el campo (ver modules.tiros_rival)"""
+    return calcular_tiros_rival(df, obtener_artefacto(df, "linea_tiempo"))
+
+
+@artefacto("zonas")
+def calcular_zonas_partido(df):
+    """Conteos por equipo, jugador, code, periodo y zona del campo (ver modules.zonas)"""
+    return calcular_conteos_zonas(df)
+
+
+def obtener_estadisticas_jugador(df, jugador, periodo=None):
+    """Estadísticas del jugador en el partido cargado en df, a partir del cubo de conteos"""
+    return estadisticas_jugador(obtener_artefacto(df, "conteos"), jugador, periodo)
+
+
+def obtener_minutos_jugados(df, jugador, periodo=None):
+    """Minutos jugados por el jugador en el partido cargado en df (ver modules.minutos)"""
+    return minutos_de_jugador(obtener_artefacto(df, "minutos"), obtener_artefacto(df, "linea_tiempo"),
+                              jugador, periodo)
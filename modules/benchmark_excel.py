@@ -0,0 +1,80 @@
+"""
+Compara el tiempo de lectura de los motores de Excel sobre exportaciones reales.
+
+Uso:
+    python -m modules.benchmark_excel uploaded_files [--repeticiones 3]
+
+Para cada motor instalado muestra la mediana del tiempo de lectura por archivo
+y comprueba que la tabla leída coincide con la del motor por defecto.
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+from modules.cargador import leer_excel, motor_disponible
+from modules.importacion import EXTENSIONES_PARTIDO
+
+MOTORES = ["pandas", "openpyxl", "calamine"]
+
+
+def buscar_excels(rutas):
+    """Archivos Excel de las rutas indicadas (archivos o carpetas, recorridas enteras)"""
+    encontrados = []
+    for ruta in rutas:
+        if os.path.isdir(ruta):
+            for carpeta, _, archivos in os.walk(ruta):
+                encontrados += [os.path.join(carpeta, a) for a in sorted(archivos)
+                                if a.lower().endswith(EXTENSIONES_PARTIDO) and not a.startswith((".", "~$"))]
+        elif ruta.lower().endswith(EXTENSIONES_PARTIDO):
+            encontrados.append(ruta)
+    return encontrados
+
+
+def medir(ruta, motor, repeticiones):
+    """Mediana del tiempo de lectura (s) y la tabla leída"""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        df = leer_excel(ruta, motor)
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos), df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("rutas", nargs="+", help="Archivos Excel o carpetas con partidos")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    archivos = buscar_excels(args.rutas)
+    if not archivos:
+        print("No se ha encontrado ningún archivo Excel.")
+        return 1
+
+    motores = [motor for motor in MOTORES if motor_disponible(motor)]
+    no_instalados = [motor for motor in MOTORES if motor not in motores]
+    if no_instalados:
+        print(f"Motores no instalados: {', '.join(no_instalados)}")
+
+    totales = dict.fromkeys(motores, 0.0)
+    print(f"{'archivo':40}" + "".join(f"{motor:>12}" for motor in motores))
+    for ruta in archivos:
+        fila = f"{os.path.basename(ruta)[:40]:40}"
+        referencia = None
+        for motor in motores:
+            segundos, df = medir(ruta, motor, args.repeticiones)
+            totales[motor] += segundos
+            if referencia is None:
+                referencia = df
+            marca = "" if df.equals(referencia) else "*"
+            fila += f"{segundos:>11.3f}{marca or 's'}"
+        print(fila)
+
+    print(f"{'TOTAL':40}" + "".join(f"{totales[motor]:>11.3f}s" for motor in motores))
+    print("* la tabla leída no coincide con la del motor por defecto")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import matplotlib.pyplot as plt
+from modules.cargador import CacheLRU
+
+# Presupuesto de memoria para los gráficos ya renderizados (MB), configurable por entorno
+CACHE_GRAFICOS_MB = float(os.environ.get("VCF_CACHE_GRAFICOS_MB", "64"))
+
+# Resolución de los gráficos, la misma en pantalla y en el PDF, configurable por entorno.
+# 150 dpi basta para pantallas de alta densidad y mantiene ligero el informe PDF
+DPI_GRAFICOS = int(os.environ.get("VCF_DPI_GRAFICOS", "150"))
+
+# Cambiar la versión invalida los gráficos en caché (p. ej. al cambiar colores o leyendas)
+VERSION_ESTILO = 1
+
+# Caché de gráficos: (firma del partido, función, filtros, versión, dpi) -> PNG.
+# Un gráfico que no se puede generar (sin datos) se guarda como b""
+_cache_graficos = CacheLRU(int(CACHE_GRAFICOS_MB * 1024 * 1024), len)
+
+# Hilo del servidor que prerenderiza gráficos en segundo plano y claves ya encoladas
+_pool_graficos = ThreadPoolExecutor(max_workers=1, thread_name_prefix="graficos")
+_pendientes = set()
+_lock_pendientes = threading.Lock()
+
+
+def _clave(df, funcion, filtros):
+    return (df.attrs.get("firma"), funcion.__module__, funcion.__qualname__, filtros, VERSION_ESTILO, DPI_GRAFICOS)
+
+
+def figura_a_png(fig, dpi=DPI_GRAFICOS):
+    """PNG de una figura de matplotlib, recortado a su contenido como en st.pyplot"""
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=dpi, bbox_inches="tight")
+    return buf.getvalue()
+
+
+def grafico_png(df, funcion, *filtros):
+    """
+    PNG del gráfico funcion(df, *filtros) del partido cargado en df, o None si la
+    función no genera figura. Se renderiza una sola vez por partido, función y
+    valores de los filtros; la pantalla y el PDF comparten el resultado.
+    """
+    clave = _clave(df, funcion, filtros)
+    firma = clave[0]
+    png = _cache_graficos.obtener(clave) if firma is not None else None
+    if png is None:
+        # Las funciones de gráfico usan solo su propia figura (sin estado global de pyplot),
+        # así que el hilo de prerenderizado no bloquea el gráfico que pide el usuario
+        fig = funcion(df, *filtros)
+        png = b""
+        if fig is not None:
+            png = figura_a_png(fig)
+            plt.close(fig)
+        if firma is not None:
+            _cache_graficos.guardar(clave, png)
+    return png or None
+
+
+def _prerenderizar(df, funcion, filtros, clave):
+    try:
+        grafico_png(df, funcion, *filtros)
+    except Exception as e:
+        print(f"Error al prerenderizar {funcion.__name__}{filtros}: {e}")
+    finally:
+        with _lock_pendientes:
+            _pendientes.discard(clave)
+
+
+def programar_graficos(df, graficos):
+    """
+    Encola en segundo plano los gráficos (funcion, filtros) que aún no estén en la
+    caché, para que estén listos cuando el usuario los abra.
+    """
+    if df.attrs.get("firma") is None:
+        return
+    for funcion, filtros in graficos:
+        clave = _clave(df, funcion, tuple(filtros))
+        with _lock_pendientes:
+            if clave in _pendientes or _cache_graficos.obtener(clave) is not None:
+                continue
+            _pendientes.add(clave)
+        _pool_graficos.submit(_prerenderizar, df, funcion, tuple(filtros), clave)
+
+
+def eliminar_graficos(ruta):
+    """Borra de la caché los gráficos de un archivo eliminado"""
+    ruta_abs = os.path.abspath(ruta)
+    _cache_graficos.eliminar_si(lambda clave: clave[0][0] == ruta_abs)
@@ -0,0 +1,64 @@
+import pickle
+import threading
+import matplotlib.pyplot as plt
+from mplsoccer import Pitch
+from modules.coordenadas import ANCHO_CAMPO, ALTO_CAMPO
+
+# Estilo del campo de todos los gráficos (césped con franjas horizontales alternas)
+ESTILO_CAMPO = {
+    "pitch_color": "#d0f0c0",
+    "line_color": "black",
+    "linewidth": 2,
+    "color_franjas": "#a0c080",
+    "alpha_franjas": 0.7,
+    "num_franjas": 5,
+}
+
+# Tamaño de figura de los gráficos de campo
+FIGSIZE_CAMPO = (16, 11)
+
+# Plantillas ya dibujadas (figura serializada) por estilo y tamaño
+_plantillas = {}
+_lock_plantillas = threading.Lock()
+
+
+def _dibujar_plantilla(estilo, figsize):
+    """Dibuja el campo y sus franjas en una figura nueva"""
+    pitch = Pitch(
+        pitch_type="custom",
+        pitch_length=ANCHO_CAMPO,
+        pitch_width=ALTO_CAMPO,
+        line_color=estilo["line_color"],
+        pitch_color=estilo["pitch_color"],
+        linewidth=estilo["linewidth"]
+    )
+    fig, ax = pitch.draw(figsize=figsize)
+
+    franja_altura = ALTO_CAMPO / estilo["num_franjas"]
+    for i in range(0, estilo["num_franjas"], 2):
+        ax.fill_between([0, ANCHO_CAMPO], i * franja_altura, (i + 1) * franja_altura,
+                        color=estilo["color_franjas"], alpha=estilo["alpha_franjas"])
+
+    fig.set_facecolor("white")
+    return fig
+
+
+def crear_campo(figsize=FIGSIZE_CAMPO, estilo=None):
+    """
+    Figura y ejes con el campo ya dibujado, listos para añadir los eventos.
+    El campo se dibuja una sola vez por estilo y tamaño; cada gráfico recibe una
+    copia de esa plantilla (la figura deserializada), que sigue siendo vectorial.
+    """
+    estilo = {**ESTILO_CAMPO, **(estilo or {})}
+    clave = (tuple(sorted(estilo.items())), tuple(figsize))
+    with _lock_plantillas:
+        plantilla = _plantillas.get(clave)
+        if plantilla is None:
+            fig = _dibujar_plantilla(estilo, figsize)
+            # Se saca de pyplot antes de serializarla: las copias no se registran como figura actual
+            plt.close(fig)
+            plantilla = pickle.dumps(fig)
+            _plantillas[clave] = plantilla
+
+    fig = pickle.loads(plantilla)
+    return fig, fig.axes[0]
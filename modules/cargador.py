@@ -0,0 +1,345 @@
+import os
+import threading
+import importlib.util
+from collections import OrderedDict
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from modules.ingesta import validar_eventos
+from modules.coordenadas import anadir_coordenadas_campo
+from modules.zonas import anadir_zonas
+
+# Presupuesto de memoria para los partidos en caché (MB), configurable por entorno
+CACHE_PARTIDOS_MB = float(os.environ.get("VCF_CACHE_PARTIDOS_MB", "512"))
+
+# Motor para leer los Excel: "calamine" (rápido, requiere python-calamine),
+# "openpyxl" (modo solo lectura) o "pandas" (lectura por defecto de pd.read_excel).
+# Si el motor elegido falla con un archivo se vuelve a la lectura por defecto.
+MOTOR_EXCEL = os.environ.get("VCF_MOTOR_EXCEL", "calamine").lower()
+
+# Directorio (junto a cada archivo) donde se guardan los datos derivados del partido
+CACHE_DIR_NOMBRE = ".cache"
+
+# Columnas de la tabla de eventos que usa la aplicación
+COLUMNAS_EVENTOS = [
+    "Team", "code", "group", "Player", "Secundary",
+    "startX", "startY", "endX", "endY",
+    "Periodo", "Mins", "text", "Jugadores", "M.J"
+]
+
+# Esquema de la tabla de eventos tras la carga:
+#   - Team, code, group, text: categóricas (los filtros comparan códigos enteros)
+#   - Player, Secundary: categóricas con el mismo conjunto de categorías,
+#     para poder compararlas, concatenarlas y cruzarlas entre sí
+#   - startX, startY, endX, endY: float32
+#   - Periodo: int8 y Mins: int16 (float32 si tienen vacíos o decimales);
+#     las filas sin evento (solo convocatoria) tienen Periodo 0
+#   - Jugadores, M.J: sin conversión
+# Los valores de las columnas de texto se guardan siempre como str.
+COLUMNAS_CATEGORICAS = ["Team", "code", "group", "text"]
+COLUMNAS_JUGADOR = ["Player", "Secundary"]
+COLUMNAS_COORDENADAS = ["startX", "startY", "endX", "endY"]
+COLUMNAS_ENTERAS = {"Periodo": "int8", "Mins": "int16"}
+
+
+class CacheLRU:
+    """
+    Caché LRU compartida por todo el proceso, con presupuesto en bytes.
+    Las entradas menos usadas se descartan cuando se supera el presupuesto.
+    """
+
+    def __init__(self, max_bytes, medir):
+        self.max_bytes = max_bytes
+        self.medir = medir
+        self._entradas = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def obtener(self, clave):
+        with self._lock:
+            if clave not in self._entradas:
+                return None
+            self._entradas.move_to_end(clave)
+            return self._entradas[clave][0]
+
+    def guardar(self, clave, valor):
+        tamano = self.medir(valor)
+        with self._lock:
+            if clave in self._entradas:
+                self._bytes -= self._entradas.pop(clave)[1]
+            # Un valor mayor que todo el presupuesto no se guarda
+            if tamano > self.max_bytes:
+                return
+            self._entradas[clave] = (valor, tamano)
+            self._bytes += tamano
+            while self._bytes > self.max_bytes and self._entradas:
+                _, (_, tamano_viejo) = self._entradas.popitem(last=False)
+                self._bytes -= tamano_viejo
+
+    def eliminar_si(self, condicion):
+        """Elimina las entradas cuya clave cumple la condición"""
+        with self._lock:
+            for clave in [c for c in self._entradas if condicion(c)]:
+                self._bytes -= self._entradas.pop(clave)[1]
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+
+    @property
+    def bytes_usados(self):
+        return self._bytes
+
+
+def _tamano_dataframe(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+# Caché de partidos: clave (ruta, tamaño, mtime) -> DataFrame
+_cache_partidos = CacheLRU(int(CACHE_PARTIDOS_MB * 1024 * 1024), _tamano_dataframe)
+
+
+def firma_archivo(ruta):
+    """
+    Devuelve la firma (ruta absoluta, tamaño, mtime en ns) de un archivo.
+    Si el archivo se reemplaza cambia la firma, y con ella la clave de caché.
+    """
+    ruta_abs = os.path.abspath(ruta)
+    stat = os.stat(ruta_abs)
+    return (ruta_abs, stat.st_size, stat.st_mtime_ns)
+
+
+def ruta_sidecar(ruta):
+    """Ruta del sidecar Parquet de un archivo: <dir>/.cache/<nombre>.parquet"""
+    directorio, nombre = os.path.split(os.path.abspath(ruta))
+    return os.path.join(directorio, CACHE_DIR_NOMBRE, f"{nombre}.parquet")
+
+
+def _proyectar(df):
+    """Se queda solo con las columnas de eventos que existan en el archivo"""
+    return df[[col for col in COLUMNAS_EVENTOS if col in df.columns]]
+
+
+def _valores_texto(serie):
+    """Valores de una columna como str, manteniendo los vacíos"""
+    valores = serie.astype(object)
+    return valores.where(valores.isna(), valores.astype(str))
+
+
+def _a_entero(serie, tipo):
+    """Convierte a entero pequeño si no hay vacíos ni decimales; si no, a float32"""
+    numeros = pd.to_numeric(serie, errors="coerce")
+    if numeros.notna().all() and (numeros % 1 == 0).all():
+        return numeros.astype(tipo)
+    return numeros.astype("float32")
+
+
+def normalizar_eventos(df):
+    """
+    Aplica el esquema compacto de la tabla de eventos (ver arriba).
+    Es idempotente: se aplica tanto al leer el Excel como al leer el sidecar.
+    """
+    df = df.copy()
+    for col in COLUMNAS_CATEGORICAS:
+        if col in df.columns:
+            df[col] = _valores_texto(df[col]).astype("category")
+
+    # Player y Secundary comparten categorías
+    columnas_jugador = [col for col in COLUMNAS_JUGADOR if col in df.columns]
+    if columnas_jugador:
+        valores = {col: _valores_texto(df[col]) for col in columnas_jugador}
+        categorias = sorted(set().union(*(set(v.dropna()) for v in valores.values())))
+        tipo_jugador = pd.CategoricalDtype(categorias)
+        for col, serie in valores.items():
+            df[col] = serie.astype(tipo_jugador)
+
+    for col in COLUMNAS_COORDENADAS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float32")
+
+    for col, tipo in COLUMNAS_ENTERAS.items():
+        if col in df.columns:
+            df[col] = _a_entero(df[col], tipo)
+
+    return df
+
+
+def contar_valores(serie):
+    """
+    value_counts sin las categorías que no aparecen: en una columna
+    categórica value_counts devuelve también las categorías con 0.
+    """
+    conteo = serie.value_counts()
+    return conteo[conteo > 0]
+
+
+def motor_disponible(motor):
+    """Indica si el motor de lectura de Excel está instalado"""
+    modulo = {"calamine": "python_calamine", "openpyxl": "openpyxl"}.get(motor)
+    return modulo is None or importlib.util.find_spec(modulo) is not None
+
+
+def leer_excel(ruta, motor=MOTOR_EXCEL):
+    """
+    Lee un Excel con el motor indicado, cargando solo las columnas de eventos.
+    Si el motor no está disponible o falla con el archivo, se lee con pd.read_excel.
+    """
+    if motor != "pandas" and motor_disponible(motor):
+        try:
+            return _proyectar(pd.read_excel(ruta, engine=motor, usecols=lambda col: col in COLUMNAS_EVENTOS))
+        except Exception as e:
+            print(f"El motor {motor} no pudo leer {ruta}, se usa el de por defecto: {e}")
+    return _proyectar(pd.read_excel(ruta))
+
+
+def _leer_original(ruta):
+    """Lee el archivo original (Excel o CSV) según su extensión"""
+    if ruta.endswith('.csv'):
+        return _proyectar(pd.read_csv(ruta))
+    return leer_excel(ruta)
+
+
+def leer_y_validar(ruta):
+    """
+    Lee el archivo original, lo valida y le aplica el esquema de eventos.
+    Devuelve (df, informe); df es None si el archivo no se puede usar.
+    """
+    df, informe = validar_eventos(_leer_original(ruta))
+    if df is not None:
+        df = normalizar_eventos(df)
+    return df, informe
+
+
+def _leer_excel(ruta):
+    """Lee y valida el archivo original; lanza ValueError si no es utilizable"""
+    df, informe = leer_y_validar(ruta)
+    if informe['errores']:
+        raise ValueError(f"{os.path.basename(ruta)}: {'; '.join(informe['errores'])}")
+    if informe['filas_descartadas']:
+        print(f"{ruta}: {len(informe['filas_descartadas'])} filas descartadas en la validación")
+    return df
+
+
+def _preparar_para_parquet(df):
+    """
+    Parquet exige un tipo por columna: las columnas de texto con valores
+    mezclados (p. ej. dorsales numéricos y nombres) se pasan a texto.
+    """
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True) not in ("string", "empty"):
+            df[col] = df[col].map(lambda v: v if pd.isna(v) else str(v))
+    return df
+
+
+def escribir_sidecar(ruta, df=None):
+    """
+    Escribe el sidecar Parquet de un archivo de partido.
+    Guarda la firma del archivo original en los metadatos para detectar si queda obsoleto.
+    """
+    ruta_abs = os.path.abspath(ruta)
+    _, tamano, mtime_ns = firma_archivo(ruta_abs)
+    if df is None:
+        df = _leer_excel(ruta_abs)
+
+    destino = ruta_sidecar(ruta_abs)
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+
+    tabla = pa.Table.from_pandas(_preparar_para_parquet(df), preserve_index=False)
+    # Añadir la firma del original a los metadatos del esquema
+    metadatos = dict(tabla.schema.metadata or {})
+    metadatos[b"origen_tamano"] = str(tamano).encode()
+    metadatos[b"origen_mtime_ns"] = str(mtime_ns).encode()
+
+    temporal = f"{destino}.tmp"
+    pq.write_table(tabla.replace_schema_metadata(metadatos), temporal)
+    os.replace(temporal, destino)
+    return destino
+
+
+def _sidecar_vigente(ruta_abs, tamano, mtime_ns):
+    """Comprueba que el sidecar existe y corresponde a la versión actual del archivo"""
+    destino = ruta_sidecar(ruta_abs)
+    if not os.path.exists(destino):
+        return False
+    try:
+        metadatos = pq.read_schema(destino).metadata or {}
+    except Exception:
+        return False
+    return (metadatos.get(b"origen_tamano") == str(tamano).encode() and
+            metadatos.get(b"origen_mtime_ns") == str(mtime_ns).encode())
+
+
+def _leer_archivo(ruta_abs, tamano, mtime_ns):
+    """
+    Lee la tabla de eventos desde el sidecar Parquet si está vigente.
+    Si falta o está obsoleto, se lee el Excel y se regenera el sidecar.
+    """
+    if _sidecar_vigente(ruta_abs, tamano, mtime_ns):
+        try:
+            destino = ruta_sidecar(ruta_abs)
+            columnas = [c for c in COLUMNAS_EVENTOS if c in pq.read_schema(destino).names]
+            return normalizar_eventos(pd.read_parquet(destino, columns=columnas))
+        except Exception:
+            pass
+
+    df = _leer_excel(ruta_abs)
+    try:
+        escribir_sidecar(ruta_abs, df)
+    except Exception as e:
+        print(f"No se pudo escribir el sidecar de {ruta_abs}: {e}")
+    return df
+
+
+def cargar_partido(ruta):
+    """
+    Carga el DataFrame de eventos de un partido usando la caché del proceso.
+
+    Devuelve una copia superficial, de modo que las páginas pueden añadir
+    columnas sin modificar la entrada compartida de la caché.
+    """
+    ruta_abs = os.path.abspath(ruta)
+    try:
+        clave = firma_archivo(ruta_abs)
+    except FileNotFoundError:
+        invalidar(ruta_abs)
+        raise
+
+    df = _cache_partidos.obtener(clave)
+    if df is None:
+        # Las coordenadas de campo y sus zonas se calculan una vez por partido, al cargarlo
+        df = anadir_zonas(anadir_coordenadas_campo(_leer_archivo(*clave)))
+        df.attrs["ruta"] = ruta_abs
+        df.attrs["firma"] = clave
+        # Descartar versiones anteriores del mismo archivo
+        invalidar(ruta_abs)
+        _cache_partidos.guardar(clave, df)
+
+    return df.copy(deep=False)
+
+
+def importar_partido(ruta):
+    """
+    Valida un archivo recién subido y guarda su tabla limpia en el sidecar,
+    de modo que las lecturas posteriores ya no tengan que validarlo.
+    Devuelve el informe de validación.
+    """
+    df, informe = leer_y_validar(ruta)
+    if df is not None:
+        escribir_sidecar(ruta, df)
+    return informe
+
+
+def invalidar(ruta):
+    """Elimina de la caché todas las versiones de un archivo (reemplazado o borrado)"""
+    ruta_abs = os.path.abspath(ruta)
+    _cache_partidos.eliminar_si(lambda clave: clave[0] == ruta_abs)
+
+
+def eliminar_derivados(ruta):
+    """Borra de la caché y del disco los datos derivados de un archivo eliminado"""
+    invalidar(ruta)
+    destino = ruta_sidecar(ruta)
+    if os.path.exists(destino):
+        os.remove(destino)
@@ -0,0 +1,269 @@
+import os
+import glob
+import uuid
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+# Directorio de archivos subidos y base de datos del catálogo
+UPLOAD_DIR = "uploaded_files"
+CATALOGO_DB = os.path.join(UPLOAD_DIR, "catalogo.db")
+
+# Tamaño de bloque para calcular el hash de un archivo
+TAMANO_BLOQUE_HASH = 1024 * 1024
+
+_inicializado = False
+_lock_inicio = threading.Lock()
+
+
+@contextmanager
+def conexion():
+    """Abre una conexión al catálogo (una transacción), confirma los cambios y la cierra"""
+    conn = sqlite3.connect(CATALOGO_DB, timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _crear_tablas():
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    with conexion() as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS partidos (
+                id TEXT PRIMARY KEY,
+                equipo TEXT NOT NULL,
+                nombre_original TEXT NOT NULL,
+                ruta TEXT NOT NULL UNIQUE,
+                fecha_subida TEXT NOT NULL,
+                tamano INTEGER NOT NULL,
+                hash TEXT NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_partidos_equipo ON partidos (equipo)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_partidos_hash ON partidos (hash)")
+        # Agregados por temporada (ver modules.agregados): aportación de cada partido
+        # y totales acumulados por equipo y por jugador
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS agregados_partido (
+                partido_id TEXT PRIMARY KEY,
+                equipo TEXT NOT NULL,
+                temporada TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                contado INTEGER NOT NULL,
+                aportacion TEXT NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_agregados_equipo_hash ON agregados_partido (equipo, hash)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS totales_equipo (
+                equipo TEXT NOT NULL,
+                temporada TEXT NOT NULL,
+                clave TEXT NOT NULL,
+                valor INTEGER NOT NULL,
+                PRIMARY KEY (equipo, temporada, clave)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS totales_jugador (
+                equipo TEXT NOT NULL,
+                temporada TEXT NOT NULL,
+                jugador TEXT NOT NULL,
+                clave TEXT NOT NULL,
+                valor INTEGER NOT NULL,
+                PRIMARY KEY (equipo, temporada, jugador, clave)
+            )
+        """)
+        # Índice jugador -> partidos (ver modules.indice_jugadores)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS jugadores_partido (
+                partido_id TEXT NOT NULL,
+                jugador TEXT NOT NULL,
+                fecha TEXT,
+                rival TEXT NOT NULL,
+                filas INTEGER NOT NULL,
+                minutos INTEGER NOT NULL,
+                estadisticas TEXT NOT NULL,
+                version INTEGER NOT NULL DEFAULT 1,
+                PRIMARY KEY (partido_id, jugador)
+            )
+        """)
+        # Catálogos creados antes de que el índice tuviera versión
+        columnas = {fila['name'] for fila in conn.execute("PRAGMA table_info(jugadores_partido)")}
+        if "version" not in columnas:
+            conn.execute("ALTER TABLE jugadores_partido ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jugadores_partido_jugador ON jugadores_partido (jugador)")
+        # Partidos ya indexados y con qué versión, aunque no tengan jugadores del Valencia
+        # o su cálculo fallara (error con el motivo)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS partidos_indexados (
+                partido_id TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                error TEXT
+            )
+        """)
+
+
+def calcular_hash(ruta):
+    """Calcula el SHA-256 del contenido de un archivo leyéndolo por bloques"""
+    sha = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(TAMANO_BLOQUE_HASH), b""):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+def _fila_a_archivo(fila):
+    """Convierte una fila del catálogo al diccionario que usan las páginas"""
+    return {
+        'id': fila['id'],
+        'nombre_original': fila['nombre_original'],
+        'ruta': fila['ruta'],
+        'fecha_subida': fila['fecha_subida'],
+        'equipo': fila['equipo'],
+        'tamano': fila['tamano'],
+        'hash': fila['hash']
+    }
+
+
+def inicializar(equipos):
+    """
+    Crea el catálogo si no existe y lo concilia con los archivos en disco.
+    Solo se ejecuta una vez por proceso: las páginas consultan el catálogo
+    en lugar de recorrer los directorios en cada recarga.
+    """
+    global _inicializado
+    with _lock_inicio:
+        if _inicializado:
+            return
+        _crear_tablas()
+        sincronizar_con_disco(equipos)
+        _inicializado = True
+
+
+def sincronizar_con_disco(equipos):
+    """
+    Añade al catálogo los archivos Excel que existan en disco y no estén
+    registrados, y elimina los registros cuyo archivo ya no existe.
+    """
+    en_disco = {}
+    for archivo in glob.glob(os.path.join(UPLOAD_DIR, "*.xlsx")) + glob.glob(os.path.join(UPLOAD_DIR, "*.xls")):
+        en_disco[archivo] = 'admin'
+    for equipo in equipos:
+        equipo_dir = os.path.join(UPLOAD_DIR, equipo.lower().replace(" ", "_"))
+        for archivo in glob.glob(os.path.join(equipo_dir, "*.xlsx")) + glob.glob(os.path.join(equipo_dir, "*.xls")):
+            en_disco[archivo] = equipo
+
+    with conexion() as conn:
+        registradas = {fila['ruta'] for fila in conn.execute("SELECT ruta FROM partidos")}
+
+    for ruta in registradas - set(en_disco):
+        with conexion() as conn:
+            conn.execute("DELETE FROM partidos WHERE ruta = ?", (ruta,))
+
+    registrar_archivos([
+        {
+            'ruta': ruta,
+            'equipo': en_disco[ruta],
+            'fecha_subida': datetime.fromtimestamp(os.path.getmtime(ruta)).strftime("%Y-%m-%d %H:%M:%S")
+        }
+        for ruta in sorted(set(en_disco) - registradas)
+    ])
+
+
+def registrar_archivo(ruta, equipo, nombre_original=None, fecha_subida=None, hash_contenido=None):
+    """
+    Registra (o actualiza, si la ruta ya existe) un archivo en el catálogo.
+    El id de un archivo se mantiene estable mientras siga registrado.
+    """
+    return registrar_archivos([{
+        'ruta': ruta,
+        'equipo': equipo,
+        'nombre_original': nombre_original,
+        'fecha_subida': fecha_subida,
+        'hash': hash_contenido
+    }])[0]
+
+
+def registrar_archivos(registros):
+    """
+    Registra varios archivos en una sola transacción (subidas en lote).
+    Cada registro es un diccionario con 'ruta' y 'equipo' y, opcionalmente,
+    'nombre_original', 'fecha_subida' y 'hash'.
+    """
+    ahora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    ids = []
+    with conexion() as conn:
+        for registro in registros:
+            ruta = registro['ruta']
+            fila = conn.execute("SELECT id FROM partidos WHERE ruta = ?", (ruta,)).fetchone()
+            archivo_id = fila['id'] if fila else str(uuid.uuid4())
+            conn.execute("""
+                INSERT OR REPLACE INTO partidos (id, equipo, nombre_original, ruta, fecha_subida, tamano, hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (
+                archivo_id,
+                registro['equipo'],
+                registro.get('nombre_original') or os.path.basename(ruta),
+                ruta,
+                registro.get('fecha_subida') or ahora,
+                os.path.getsize(ruta),
+                registro.get('hash') or calcular_hash(ruta)
+            ))
+            ids.append(archivo_id)
+
+    return [obtener_archivo(archivo_id) for archivo_id in ids]
+
+
+def obtener_archivo(archivo_id):
+    """Devuelve un archivo del catálogo por su id, o None si no existe"""
+    with conexion() as conn:
+        fila = conn.execute("SELECT * FROM partidos WHERE id = ?", (archivo_id,)).fetchone()
+    return _fila_a_archivo(fila) if fila else None
+
+
+def eliminar_archivo(archivo_id):
+    """Elimina un archivo del catálogo y devuelve su registro"""
+    archivo = obtener_archivo(archivo_id)
+    if archivo:
+        with conexion() as conn:
+            conn.execute("DELETE FROM partidos WHERE id = ?", (archivo_id,))
+    return archivo
+
+
+def buscar_por_hash(hash_contenido):
+    """Devuelve el primer archivo registrado con ese contenido, o None"""
+    with conexion() as conn:
+        fila = conn.execute("SELECT * FROM partidos WHERE hash = ? ORDER BY rowid LIMIT 1", (hash_contenido,)).fetchone()
+    return _fila_a_archivo(fila) if fila else None
+
+
+def sin_duplicados(archivos):
+    """
+    Quita de una lista de archivos los que repiten contenido (mismo hash),
+    conservando el primero. Evita contar dos veces un partido en los totales.
+    """
+    vistos = set()
+    unicos = []
+    for archivo in archivos:
+        hash_contenido = archivo.get('hash')
+        if hash_contenido in vistos:
+            continue
+        if hash_contenido:
+            vistos.add(hash_contenido)
+        unicos.append(archivo)
+    return unicos
+
+
+def listar_archivos(equipo=None):
+    """Lista los archivos del catálogo, opcionalmente filtrados por equipo"""
+    with conexion() as conn:
+        if equipo:
+            filas = conn.execute("SELECT * FROM partidos WHERE equipo = ? ORDER BY rowid", (equipo,)).fetchall()
+        else:
+            filas = conn.execute("SELECT * FROM partidos ORDER BY rowid").fetchall()
+    return [_fila_a_archivo(fila) for fila in filas]
@@ -0,0 +1,101 @@
+import pandas as pd
+
+# Dimensiones del cubo de conteos de un partido
+DIMENSIONES_CUBO = ["Team", "Player", "Periodo", "code", "group", "text", "completado"]
+
+# Estadísticas de un jugador que se obtienen del cubo
+ESTADISTICAS_JUGADOR = [
+    "total_acciones", "pases_completados", "pases_fallados", "finalizaciones",
+    "goles", "tiros_puerta", "tiros_fuera", "faltas", "recuperaciones",
+    "profundidad", "cara", "area"
+]
+
+
+def calcular_cubo_conteos(df):
+    """
+    Número de eventos del partido por equipo, jugador, periodo, acción (code),
+    group, text y si el evento tiene receptor (completado: Secundary no vacío).
+    Devuelve un DataFrame con una fila por combinación existente y su número en 'n'.
+    Las filas sin evento (solo convocatoria) no se cuentan.
+    """
+    eventos = df[df["code"].notna()]
+    return (eventos.assign(completado=eventos["Secundary"].notna())
+            .groupby(DIMENSIONES_CUBO, observed=True, dropna=False)
+            .size().reset_index(name="n"))
+
+
+def filtrar_cubo(cubo, jugador=None, periodo=None, equipo="Valencia"):
+    """Filas del cubo de un equipo, opcionalmente de un jugador y un periodo"""
+    filtro = cubo["Team"] == equipo
+    if jugador is not None:
+        filtro &= cubo["Player"] == jugador
+    if periodo is not None:
+        filtro &= cubo["Periodo"] == periodo
+    return cubo[filtro]
+
+
+def _indicadores(filas):
+    """Aportación de cada fila del cubo a cada estadística de jugador (filas x ESTADISTICAS_JUGADOR)"""
+    n, code = filas["n"], filas["code"]
+    pases = code == "Pases"
+    finalizaciones = code == "Finalizaciones"
+    indicadores = pd.DataFrame({
+        "total_acciones": n > 0,
+        "pases_completados": pases & filas["completado"],
+        "pases_fallados": pases & ~filas["completado"],
+        "finalizaciones": finalizaciones,
+        "goles": finalizaciones & (filas["text"] == "Gol"),
+        "tiros_puerta": finalizaciones & (filas["group"] == "A puerta"),
+        "tiros_fuera": finalizaciones & (filas["group"] == "Fuera"),
+        "faltas": code == "Faltas",
+        "recuperaciones": code == "Recuperaciones",
+        "profundidad": code == "Encontrar Futbolista en profundidad",
+        "cara": code == "Encontrar Futbolista de cara",
+        "area": code == "Atacar el área",
+    }, index=filas.index)
+    return indicadores.mul(n, axis=0).astype("int64")
+
+
+def estadisticas_jugador(cubo, jugador, periodo=None):
+    """
+    Estadísticas de un jugador del Valencia en un partido (o en un periodo),
+    sumando las filas del cubo de conteos. Devuelve un diccionario de enteros.
+    """
+    totales = _indicadores(filtrar_cubo(cubo, jugador, periodo)).sum()
+    return {clave: int(totales[clave]) for clave in ESTADISTICAS_JUGADOR}
+
+
+def estadisticas_por_jugador(cubo, periodo=None):
+    """Estadísticas de todos los jugadores del Valencia a la vez: DataFrame jugador x ESTADISTICAS_JUGADOR"""
+    filas = filtrar_cubo(cubo, periodo=periodo)
+    filas = filas[filas["Player"].notna()]
+    return _indicadores(filas).groupby(filas["Player"].astype(str)).sum()
+
+
+def estadisticas_equipo(cubo):
+    """Totales del Valencia y de su rival en el partido (goles, tiros, faltas, corners y pases)"""
+    valencia = cubo["Team"] == "Valencia"
+    rival = cubo["Team"].notna() & ~valencia
+    code, group, n = cubo["code"], cubo["group"], cubo["n"]
+    finalizaciones = code == "Finalizaciones"
+    goles = finalizaciones & (cubo["text"] == "Gol")
+    # Corners: code="Est.Generales" y group="Saque de esquina"
+    corners = (code == "Est.Generales") & (group == "Saque de esquina")
+    pases = valencia & (code == "Pases")
+
+    def contar(filtro):
+        return int(n[filtro].sum())
+
+    return {
+        "goles_favor": contar(valencia & goles),
+        "goles_contra": contar(rival & goles),
+        "faltas_realizadas": contar(valencia & (code == "Faltas")),
+        "faltas_recibidas": contar(rival & (code == "Faltas")),
+        "tiros_puerta": contar(valencia & finalizaciones & (group == "A puerta")),
+        "tiros_fuera": contar(valencia & finalizaciones & (group == "Fuera")),
+        "corners_favor": contar(valencia & corners),
+        "corners_contra": contar(rival & corners),
+        "pases_completados": contar(pases & cubo["completado"]),
+        "pases_fallados": contar(pases & ~cubo["completado"]),
+    }
+
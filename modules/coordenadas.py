@@ -0,0 +1,40 @@
+import os
+import numpy as np
+
+# Dimensiones del sistema de coordenadas de los archivos exportados y su desplazamiento
+# (el origen del campo no está en 0,0), configurables por entorno
+ANCHO_ORIGEN = float(os.environ.get("VCF_ANCHO_ORIGEN", "240"))
+ALTO_ORIGEN = float(os.environ.get("VCF_ALTO_ORIGEN", "150"))
+DESPLAZAMIENTO_X = float(os.environ.get("VCF_DESPLAZAMIENTO_X", "5"))
+DESPLAZAMIENTO_Y = float(os.environ.get("VCF_DESPLAZAMIENTO_Y", "5.333"))
+
+# Dimensiones del campo sobre el que se dibuja (mplsoccer, pitch_type="custom")
+ANCHO_CAMPO = 120
+ALTO_CAMPO = 80
+
+# Columnas originales -> columnas convertidas que se añaden al cargar un partido
+COLUMNAS_CONVERTIDAS = {
+    ("startX", "startY"): ("startX_conv", "startY_conv"),
+    ("endX", "endY"): ("endX_conv", "endY_conv"),
+}
+
+
+def convertir_coordenadas(x, y, ancho_origen=ANCHO_ORIGEN, alto_origen=ALTO_ORIGEN,
+                          desplazamiento_x=DESPLAZAMIENTO_X, desplazamiento_y=DESPLAZAMIENTO_Y):
+    """
+    Convierte coordenadas originales (por defecto 240x150) al campo 120x80,
+    reflejando el eje Y. Acepta escalares, arrays o Series y opera sobre
+    todos los valores a la vez; los vacíos se mantienen como NaN.
+    """
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    x_campo = (x - desplazamiento_x) * (ANCHO_CAMPO / ancho_origen)
+    y_campo = ALTO_CAMPO - (y - desplazamiento_y) * (ALTO_CAMPO / alto_origen)
+    return x_campo, y_campo
+
+
+def anadir_coordenadas_campo(df):
+    """Añade a df las columnas *_conv con las coordenadas de inicio y fin en el campo"""
+    for (col_x, col_y), (conv_x, conv_y) in COLUMNAS_CONVERTIDAS.items():
+        df[conv_x], df[conv_y] = convertir_coordenadas(df[col_x], df[col_y])
+    return df
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+from matplotlib.collections import LineCollection
+
+# Recuadro blanco semitransparente detrás de los nombres de los jugadores
+CAJA_NOMBRE = dict(facecolor='white', alpha=0.7, edgecolor='none', pad=1)
+
+
+def _por_elemento(valor, n):
+    """Array de n elementos: el propio valor si ya es una secuencia, o el valor repetido"""
+    if isinstance(valor, (str, int, float)):
+        return np.full(n, valor, dtype=object)
+    return np.asarray(valor, dtype=object)
+
+
+def dibujar_lineas(ax, x0, y0, x1, y1, color, anchos=2, alpha=0.7, zorder=2):
+    """Dibuja todos los segmentos (x0, y0) -> (x1, y1) con una sola LineCollection"""
+    segmentos = np.stack([
+        np.column_stack([np.asarray(x0, dtype="float64"), np.asarray(y0, dtype="float64")]),
+        np.column_stack([np.asarray(x1, dtype="float64"), np.asarray(y1, dtype="float64")]),
+    ], axis=1)
+    if len(segmentos) == 0:
+        return None
+    # Extremos como los de ax.plot (capstyle 'projecting')
+    lineas = LineCollection(segmentos, colors=color, linewidths=anchos, alpha=alpha,
+                            zorder=zorder, capstyle="projecting")
+    ax.add_collection(lineas, autolim=False)
+    return lineas
+
+
+def dibujar_puntos(ax, x, y, colores, tamanos=100, marcadores="o", bordes="black", zorder=3):
+    """
+    Dibuja todos los puntos con una llamada a scatter por tipo de marcador.
+    colores, tamanos, marcadores y bordes pueden ser un valor común o uno por punto.
+    """
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    n = len(x)
+    colores, bordes, marcadores = (_por_elemento(valor, n) for valor in (colores, bordes, marcadores))
+    tamanos = np.broadcast_to(np.asarray(tamanos, dtype="float64"), (n,))
+    for marcador in pd.unique(marcadores):
+        seleccion = marcadores == marcador
+        ax.scatter(x[seleccion], y[seleccion], c=list(colores[seleccion]), s=tamanos[seleccion],
+                   edgecolors=list(bordes[seleccion]), marker=marcador, zorder=zorder)
+
+
+def nombre_corto(jugador):
+    """Nombre del jugador sin el número si está en formato "#. Nombre\""""
+    return jugador.split(". ")[1] if ". " in jugador else jugador
+
+
+def dibujar_nombres(ax, x, y, jugadores, caja=CAJA_NOMBRE, fontsize=12, desplazamiento=1.5):
+    """Escribe el nombre corto de cada jugador justo encima de su punto"""
+    for xi, yi, jugador in zip(x, y, jugadores):
+        ax.text(xi, yi + desplazamiento, nombre_corto(jugador), fontsize=fontsize, color="black",
+                ha="center", va="center", bbox=caja)
+
+
+# Estilo de cada tipo de tiro: (color, marcador, tamaño)
+ESTILOS_TIRO = {
+    "gol": ("green", "*", 200),
+    "a_puerta": ("blue", "o", 120),
+    "fuera": ("red", "o", 120),
+    "otro": ("black", "o", 100),
+}
+
+
+def clasificar_tiros(tiros):
+    """Tipo de cada tiro: 'gol' (text contiene "Gol"), 'a_puerta' (group A puerta o Dentro), 'fuera' u 'otro'"""
+    es_gol = tiros["text"].astype("string").str.contains("Gol", regex=False).fillna(False).to_numpy(bool)
+    a_puerta = tiros["group"].isin(["A puerta", "Dentro"]).to_numpy(bool)
+    fuera = (tiros["group"] == "Fuera").to_numpy(bool)
+    return np.select([es_gol, a_puerta, fuera], ["gol", "a_puerta", "fuera"], "otro")
+
+
+def contar_tiros(tipos):
+    """Número de tiros de cada tipo (tipos calculados con clasificar_tiros)"""
+    return {tipo: int((tipos == tipo).sum()) for tipo in ESTILOS_TIRO}
+
+
+def dibujar_tiros(ax, tiros):
+    """Dibuja los tiros con el estilo de su tipo y el nombre del tirador. Devuelve el número de tiros de cada tipo."""
+    tipos = clasificar_tiros(tiros)
+    colores = [ESTILOS_TIRO[tipo][0] for tipo in tipos]
+    marcadores = [ESTILOS_TIRO[tipo][1] for tipo in tipos]
+    tamanos = [ESTILOS_TIRO[tipo][2] for tipo in tipos]
+    x, y = tiros["startX_conv"], tiros["startY_conv"]
+    dibujar_puntos(ax, x, y, colores, tamanos, marcadores)
+    dibujar_nombres(ax, x, y, tiros["Player"])
+    return contar_tiros(tipos)
+
+
+def dibujar_pases(ax, pases, color, suplentes=()):
+    """
+    Dibuja una línea por pase, el marcador del pasador y el del receptor (cuadrado
+    si es suplente, círculo si es titular, x si el pase no tiene receptor) y sus nombres.
+    """
+    x0, y0 = pases["startX_conv"].to_numpy("float64"), pases["startY_conv"].to_numpy("float64")
+    x1, y1 = pases["endX_conv"].to_numpy("float64"), pases["endY_conv"].to_numpy("float64")
+    dibujar_lineas(ax, x0, y0, x1, y1, color)
+
+    pasadores, receptores = pases["Player"].astype(object), pases["Secundary"].astype(object)
+    con_receptor = receptores.notna().to_numpy()
+    marcadores_pasador = np.where(pasadores.isin(suplentes), "s", "o")
+    marcadores_receptor = np.where(con_receptor, np.where(receptores.isin(suplentes), "s", "o"), "x")
+    dibujar_puntos(ax, np.concatenate([x0, x1]), np.concatenate([y0, y1]), "black", 100,
+                   np.concatenate([marcadores_pasador, marcadores_receptor]), color)
+
+    dibujar_nombres(ax, x0, y0, pasadores)
+    dibujar_nombres(ax, x1[con_receptor], y1[con_receptor], receptores[con_receptor])
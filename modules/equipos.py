@@ -1,11 +1,11 @@
 import streamlit as st
 import os
 import json
-import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from PIL import Image
 import base64
+from modules import agregados
 
 # Constantes
 EQUIPOS_DATA_DIR = "equipos_data"
@@ -55,86 +55,34 @@ def cargar_equipos():
         # En caso de error, devolver estructura vacía
         return {"Infantil": [], "Cadete": [], "Juvenil": [], "Senior": []}
 
-# Función para procesar estadísticas de un equipo desde los archivos Excel
-def procesar_estadisticas_equipo(equipo_nombre):
-    # Buscar archivos de este equipo
-    archivos_equipo = [a for a in st.session_state.archivos_subidos if a.get('equipo') == equipo_nombre]
-    
-    if not archivos_equipo:
+# Función para obtener las estadísticas acumuladas de un equipo
+def procesar_estadisticas_equipo(equipo_nombre, temporada=None):
+    """
+    Totales del equipo (de una temporada o de todas) leídos de los agregados,
+    que se actualizan al subir y eliminar partidos.
+    """
+    estadisticas, num_partidos = agregados.totales_equipo(equipo_nombre, temporada)
+    if num_partidos == 0:
         return None, 0
-    
-    # Inicializar estadísticas
-    estadisticas = {
-        "goles_favor": 0,
-        "goles_contra": 0,
-        "faltas_realizadas": 0,
-        "faltas_recibidas": 0,
-        "tiros_puerta": 0,
-        "tiros_fuera": 0,
-        "corners_favor": 0,
-        "corners_contra": 0,
-        "pases_completados": 0,
-        "pases_fallados": 0
-    }
-    
-    # Procesar cada archivo
-    for archivo in archivos_equipo:
-        try:
-            # Cargar Excel
-            df = pd.read_excel(archivo['ruta'])
-            
-            # Mostrar las primeras filas del DataFrame para depuración
-            st.write(f"Analizando archivo: {archivo['nombre_original']}")
-            
-            # Filtrar datos del Valencia y del rival
-            df_valencia = df[df["Team"] == "Valencia"]
-            df_rival = df[df["Team"] != "Valencia"]
-            
-            # Contar finalizaciones y goles
-            df_fin_valencia = df_valencia[df_valencia["code"] == "Finalizaciones"]
-            df_fin_rival = df_rival[df_rival["code"] == "Finalizaciones"]
-            
-            # Goles
-            estadisticas["goles_favor"] += df_fin_valencia[df_fin_valencia["text"] == "Gol"].shape[0]
-            estadisticas["goles_contra"] += df_fin_rival[df_fin_rival["text"] == "Gol"].shape[0]
-            
-            # Tiros
-            estadisticas["tiros_puerta"] += df_fin_valencia[df_fin_valencia["group"] == "A puerta"].shape[0]
-            estadisticas["tiros_fuera"] += df_fin_valencia[df_fin_valencia["group"] == "Fuera"].shape[0]
-            
-            # Faltas
-            estadisticas["faltas_realizadas"] += df_valencia[df_valencia["code"] == "Faltas"].shape[0]
-            estadisticas["faltas_recibidas"] += df_rival[df_rival["code"] == "Faltas"].shape[0]
-            
-            # Corners - Buscando en code="Est.Generales" y group="Saque de esquina"
-            df_corners_valencia = df_valencia[
-                (df_valencia["code"] == "Est.Generales") & 
-                (df_valencia["group"] == "Saque de esquina")
-            ]
-            df_corners_rival = df_rival[
-                (df_rival["code"] == "Est.Generales") & 
-                (df_rival["group"] == "Saque de esquina")
-            ]
-            
-            estadisticas["corners_favor"] += len(df_corners_valencia)
-            estadisticas["corners_contra"] += len(df_corners_rival)
-            
-            # Pases
-            df_pases = df_valencia[df_valencia["code"] == "Pases"]
-            estadisticas["pases_completados"] += df_pases["Secundary"].notna().sum()
-            estadisticas["pases_fallados"] += df_pases["Secundary"].isna().sum()
-            
-        except Exception as e:
-            st.error(f"Error al procesar archivo {archivo['nombre_original']}: {str(e)}")
-            import traceback
-            st.text(traceback.format_exc())
-    
-    return estadisticas, len(archivos_equipo)
+    return estadisticas, num_partidos
+
+# Función para agregar los partidos del equipo que aún no lo estén (p. ej. subidos antes de existir los agregados)
+def sincronizar_agregados(equipo_nombre):
+    for archivo in agregados.sincronizar_equipo(equipo_nombre):
+        st.error(f"Error al procesar archivo {archivo['nombre_original']}")
+
+# Selector de temporada del equipo (None = todas)
+def seleccionar_temporada(equipo_nombre):
+    temporadas = agregados.temporadas_equipo(equipo_nombre)
+    if len(temporadas) <= 1:
+        return None
+    opcion = st.selectbox("Temporada", ["Todas"] + temporadas, key=f"temporada_{equipo_nombre}")
+    return None if opcion == "Todas" else opcion
 
 # Función para mostrar estadísticas de un equipo
-def mostrar_estadisticas_equipo(equipo_nombre, estadisticas, num_partidos):
+def mostrar_estadisticas_equipo(equipo_nombre, estadisticas, num_partidos, temporada=None):
     st.subheader(f"Estadísticas de {equipo_nombre}")
-    st.write(f"Datos acumulados de {num_partidos} partidos")
+    st.write(f"Datos acumulados de {num_partidos} partidos" + (f" (temporada {temporada})" if temporada else ""))
     
     # Crear gráfico de barras con las estadísticas (sin amarillas y con corners separados)
     categorias = [
@@ -254,6 +202,19 @@ def mostrar_estadisticas_equipo(equipo_nombre, estadisticas, num_partidos):
         
         st.plotly_chart(fig, use_container_width=True)
 
+    # Totales por jugador
+    totales_jugadores = agregados.totales_jugadores(equipo_nombre, temporada)
+    if not totales_jugadores.empty:
+        st.subheader("Totales por jugador")
+        columnas = {
+            "partidos": "Partidos", "minutos": "Minutos", "total_acciones": "Acciones",
+            "pases_completados": "Pases completados", "pases_fallados": "Pases fallados",
+            "finalizaciones": "Finalizaciones", "goles": "Goles", "tiros_puerta": "Tiros a puerta",
+            "faltas": "Faltas", "recuperaciones": "Recuperaciones"
+        }
+        tabla = totales_jugadores.reindex(columns=list(columnas), fill_value=0).rename(columns=columnas)
+        st.dataframe(tabla.sort_values("Minutos", ascending=False), use_container_width=True)
+
 # Función para mostrar el navegador de equipos
 def mostrar_navegador_equipos():
     st.title("📊 Navegador de Equipos")
@@ -263,7 +224,9 @@ def mostrar_navegador_equipos():
         equipo_nombre = st.session_state.get("equipo_seleccionado", "")
         if equipo_nombre:
             # Procesar estadísticas del equipo
-            estadisticas, num_partidos = procesar_estadisticas_equipo(equipo_nombre)
+            sincronizar_agregados(equipo_nombre)
+            temporada = seleccionar_temporada(equipo_nombre)
+            estadisticas, num_partidos = procesar_estadisticas_equipo(equipo_nombre, temporada)
             
             # Botón para volver
             if st.button("⬅️ Volver al navegador de equipos", use_container_width=True):
@@ -275,7 +238,7 @@ def mostrar_navegador_equipos():
                 return
             
             # Mostrar estadísticas
-            mostrar_estadisticas_equipo(equipo_nombre, estadisticas, num_partidos)
+            mostrar_estadisticas_equipo(equipo_nombre, estadisticas, num_partidos, temporada)
             return
     
     # Estilos CSS personalizados para las tarjetas de equipo
@@ -389,12 +352,14 @@ def mostrar_panel_equipo():
     equipo_nombre = st.session_state["equipo_seleccionado"]
     
     # Procesar y mostrar estadísticas
-    estadisticas, num_partidos = procesar_estadisticas_equipo(equipo_nombre)
+    sincronizar_agregados(equipo_nombre)
+    temporada = seleccionar_temporada(equipo_nombre)
+    estadisticas, num_partidos = procesar_estadisticas_equipo(equipo_nombre, temporada)
     
     if not estadisticas or num_partidos == 0:
         st.warning(f"No hay archivos disponibles para {equipo_nombre}. Sube algunos archivos para ver estadísticas.")
     else:
-        mostrar_estadisticas_equipo(equipo_nombre, estadisticas, num_partidos)
+        mostrar_estadisticas_equipo(equipo_nombre, estadisticas, num_partidos, temporada)
     
     # Botón para volver
     if st.button("⬅️ Volver al navegador de equipos", use_container_width=True):
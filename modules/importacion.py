@@ -0,0 +1,130 @@
+import os
+import hashlib
+import zipfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from modules.cargador import importar_partido
+
+# Número de procesos para importar en lote (0 = uno por CPU), configurable por entorno
+PROCESOS_IMPORTACION = int(os.environ.get("VCF_PROCESOS_IMPORTACION", "0")) or os.cpu_count() or 1
+
+# Extensiones de los archivos de partido
+EXTENSIONES_PARTIDO = (".xlsx", ".xls")
+
+# Tamaño de bloque al copiar los archivos subidos a disco
+TAMANO_BLOQUE_ESCRITURA = 1024 * 1024
+
+# Tamaño máximo de un archivo de partido (MB), configurable por entorno
+TAMANO_MAXIMO_MB = float(os.environ.get("VCF_TAMANO_MAXIMO_MB", "50"))
+
+
+def _es_archivo_partido(nombre):
+    """Descarta carpetas, archivos ocultos y temporales de Excel/macOS"""
+    base = os.path.basename(nombre)
+    return (
+        base.lower().endswith(EXTENSIONES_PARTIDO) and
+        not base.startswith((".", "~$")) and
+        "__MACOSX" not in nombre
+    )
+
+
+def recorrer_archivos_subidos(uploaded_files):
+    """
+    Recorre los archivos subidos (Excel sueltos o .zip) y produce pares
+    (nombre, flujo) para copiarlos a disco por bloques, sin cargarlos enteros
+    en memoria otra vez. De los .zip solo se toman los Excel; su nombre es la
+    ruta dentro del .zip (ver nombre_sin_colision).
+    """
+    for uploaded_file in uploaded_files:
+        if uploaded_file.name.lower().endswith(".zip"):
+            uploaded_file.seek(0)
+            with zipfile.ZipFile(uploaded_file) as zf:
+                for miembro in zf.infolist():
+                    if miembro.is_dir() or not _es_archivo_partido(miembro.filename):
+                        continue
+                    with zf.open(miembro) as flujo:
+                        yield miembro.filename, flujo
+        elif _es_archivo_partido(uploaded_file.name):
+            uploaded_file.seek(0)
+            yield uploaded_file.name, uploaded_file
+
+
+def nombre_sin_colision(nombre, usados):
+    """
+    Nombre del archivo sin su carpeta, con sufijo _2, _3... si ya se ha usado en
+    el mismo lote (p. ej. jornada1/partido.xlsx y jornada2/partido.xlsx de un .zip).
+    El sufijo va detrás del rival, así que la fecha y el rival se siguen leyendo del nombre.
+    """
+    base, extension = os.path.splitext(os.path.basename(nombre))
+    candidato = base + extension
+    n = 2
+    while candidato in usados:
+        candidato = f"{base}_{n}{extension}"
+        n += 1
+    usados.add(candidato)
+    return candidato
+
+
+def copiar_con_hash(flujo, destino, tamano_maximo_mb=TAMANO_MAXIMO_MB):
+    """
+    Copia un flujo a destino por bloques calculando su SHA-256 al vuelo.
+    Si supera el tamaño máximo se borra lo escrito y se lanza ValueError.
+    Devuelve el hash del contenido.
+    """
+    limite = int(tamano_maximo_mb * 1024 * 1024)
+    sha = hashlib.sha256()
+    escritos = 0
+    try:
+        with open(destino, "wb") as f:
+            for bloque in iter(lambda: flujo.read(TAMANO_BLOQUE_ESCRITURA), b""):
+                escritos += len(bloque)
+                if escritos > limite:
+                    raise ValueError(f"supera el tamaño máximo de {tamano_maximo_mb:g} MB")
+                sha.update(bloque)
+                f.write(bloque)
+    except Exception:
+        if os.path.exists(destino):
+            os.remove(destino)
+        raise
+    return sha.hexdigest()
+
+
+def _procesar_archivo(ruta):
+    """Trabajo de cada proceso: valida el archivo y escribe su sidecar"""
+    try:
+        informe = importar_partido(ruta)
+    except Exception as e:
+        informe = {'errores': [f"No se pudo leer el archivo: {e}"], 'filas_descartadas': []}
+    return ruta, informe
+
+
+def importar_lote(rutas, al_terminar_archivo=None):
+    """
+    Valida y convierte a Parquet un lote de archivos ya guardados en disco,
+    en paralelo con un pool de procesos.
+
+    Devuelve {ruta: informe}. Si se indica, al_terminar_archivo(ruta, informe,
+    completados, total) se llama cada vez que termina un archivo.
+    """
+    resultados = {}
+    total = len(rutas)
+
+    def anotar(ruta, informe):
+        resultados[ruta] = informe
+        if al_terminar_archivo:
+            al_terminar_archivo(ruta, informe, len(resultados), total)
+
+    procesos = min(PROCESOS_IMPORTACION, total)
+    if procesos <= 1:
+        for ruta in rutas:
+            anotar(*_procesar_archivo(ruta))
+        return resultados
+
+    # "spawn" evita heredar los hilos del servidor de Streamlit en los procesos hijos
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto) as pool:
+        futuros = [pool.submit(_procesar_archivo, ruta) for ruta in rutas]
+        for futuro in as_completed(futuros):
+            anotar(*futuro.result())
+
+    return resultados
@@ -0,0 +1,129 @@
+import json
+from datetime import datetime
+from modules import catalogo
+from modules.cargador import cargar_partido
+from modules.artefactos import obtener_artefacto
+from modules.conteos import ESTADISTICAS_JUGADOR, estadisticas_por_jugador
+from modules.tiros_rival import tiros_recibidos
+
+# Cambiar la versión hace que se vuelvan a indexar los partidos (p. ej. al cambiar un cálculo)
+VERSION_INDICE = 2
+
+
+def fecha_y_rival(nombre_archivo):
+    """Fecha (o None) y rival de un partido a partir del nombre del archivo (formato YYYY-MM-DD_Rival.xlsx)"""
+    partes = nombre_archivo.split('_')
+    if len(partes) < 2:
+        return None, nombre_archivo
+    try:
+        fecha = datetime.strptime(partes[0], "%Y-%m-%d").date()
+    except ValueError:
+        fecha = None
+    return fecha, partes[1].replace('.xlsx', '')
+
+
+def calcular_filas_partido(archivo):
+    """
+    Una fila por jugador del Valencia que aparece en el partido: sus filas de
+    eventos, minutos jugados y estadísticas (las del jugador y los tiros del rival
+    recibidos con él en el campo).
+    """
+    df = cargar_partido(archivo['ruta'])
+    cubo = obtener_artefacto(df, "conteos")
+    minutos = obtener_artefacto(df, "minutos")["minutos"]
+    fecha, rival = fecha_y_rival(archivo['nombre_original'])
+
+    filas_jugador = df.loc[(df["Team"] == "Valencia") & df["Player"].notna(), "Player"].astype(str).value_counts()
+    filas_jugador = filas_jugador.drop("Valencia", errors="ignore")
+    por_jugador = estadisticas_por_jugador(cubo).reindex(filas_jugador.index, fill_value=0)
+    resumen_rival = obtener_artefacto(df, "tiros_rival")
+
+    return [
+        (
+            archivo['id'], jugador, fecha.isoformat() if fecha else None, rival,
+            int(filas_jugador[jugador]), int(minutos.get(jugador, 0)),
+            json.dumps({**{clave: int(por_jugador.at[jugador, clave]) for clave in ESTADISTICAS_JUGADOR},
+                        **tiros_recibidos(resumen_rival, jugador)}),
+            VERSION_INDICE
+        )
+        for jugador in filas_jugador.index
+    ]
+
+
+def indexar_partidos(archivos):
+    """
+    Añade al índice los partidos indicados (registros del catálogo) y los marca como
+    indexados con la versión actual, también los que fallen. Devuelve los que fallen.
+    """
+    filas = []
+    fallidos = []
+    for archivo in archivos:
+        try:
+            filas.append((archivo['id'], calcular_filas_partido(archivo), None))
+        except Exception as e:
+            print(f"No se pudo indexar {archivo['ruta']}: {e}")
+            filas.append((archivo['id'], [], str(e)))
+            fallidos.append(archivo)
+
+    with catalogo.conexion() as conn:
+        for archivo_id, filas_partido, error in filas:
+            conn.execute("DELETE FROM jugadores_partido WHERE partido_id = ?", (archivo_id,))
+            conn.executemany("""
+                INSERT INTO jugadores_partido (partido_id, jugador, fecha, rival, filas, minutos, estadisticas, version)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, filas_partido)
+            conn.execute("INSERT OR REPLACE INTO partidos_indexados (partido_id, version, error) VALUES (?, ?, ?)",
+                         (archivo_id, VERSION_INDICE, error))
+    return fallidos
+
+
+def quitar_partido(archivo_id):
+    """Quita del índice un partido eliminado"""
+    with catalogo.conexion() as conn:
+        conn.execute("DELETE FROM jugadores_partido WHERE partido_id = ?", (archivo_id,))
+        conn.execute("DELETE FROM partidos_indexados WHERE partido_id = ?", (archivo_id,))
+
+
+def sincronizar(archivos):
+    """
+    Indexa los partidos de la lista que aún no estén marcados como indexados
+    (subidos antes de existir el índice) o que se indexaron con otra versión,
+    y quita los que ya no están en el catálogo. Devuelve los que fallen, también
+    los que ya fallaron antes con esta versión (no se vuelven a calcular).
+    """
+    with catalogo.conexion() as conn:
+        conn.execute("DELETE FROM jugadores_partido WHERE partido_id NOT IN (SELECT id FROM partidos)")
+        conn.execute("DELETE FROM partidos_indexados WHERE partido_id NOT IN (SELECT id FROM partidos)")
+        marcas = {fila['partido_id']: fila['error'] for fila in conn.execute(
+            "SELECT partido_id, error FROM partidos_indexados WHERE version = ?", (VERSION_INDICE,))}
+    pendientes = [archivo for archivo in archivos if archivo['id'] not in marcas]
+    fallidos_antes = [archivo for archivo in archivos if marcas.get(archivo['id']) is not None]
+    return fallidos_antes + (indexar_partidos(pendientes) if pendientes else [])
+
+
+def filas_de_partidos(ids_partidos, jugador=None):
+    """
+    Filas del índice de los partidos indicados (opcionalmente de un solo jugador):
+    lista de diccionarios con partido_id, jugador, fecha, rival, filas, minutos y estadisticas.
+    """
+    if not ids_partidos:
+        return []
+    consulta = f"SELECT * FROM jugadores_partido WHERE partido_id IN ({', '.join('?' * len(ids_partidos))})"
+    parametros = list(ids_partidos)
+    if jugador is not None:
+        consulta += " AND jugador = ?"
+        parametros.append(jugador)
+    with catalogo.conexion() as conn:
+        filas = conn.execute(consulta, parametros).fetchall()
+    return [
+        {
+            'partido_id': fila['partido_id'],
+            'jugador': fila['jugador'],
+            'fecha': datetime.strptime(fila['fecha'], "%Y-%m-%d").date() if fila['fecha'] else None,
+            'rival': fila['rival'],
+            'filas': fila['filas'],
+            'minutos': fila['minutos'],
+            'estadisticas': json.loads(fila['estadisticas'])
+        }
+        for fila in filas
+    ]
@@ -6,7 +6,7 @@ import plotly.graph_objects as go
 import os
 import json
 import base64
-from mplsoccer import Pitch
+from modules.campo import crear_campo
 import matplotlib.pyplot as plt
 # Nuevas importaciones para PDF
 import io
@@ -24,6 +24,10 @@ from jinja2 import Template
 import weasyprint
 import tempfile
 from datetime import datetime
+from modules.cargador import cargar_partido
+from modules.artefactos import obtener_artefacto, obtener_estadisticas_jugador, obtener_minutos_jugados
+from modules.tiros_rival import tiros_recibidos, detalle_tiros
+from modules.dibujo import dibujar_lineas, dibujar_puntos
 
 # Constantes
 PLAYERS_DATA_DIR = "players_data"
@@ -113,103 +117,27 @@ def visualizar_pases_campo(df_jugador):
         df_jugador: DataFrame con las acciones del jugador seleccionado
     """
     # Filtrar solo los pases
-    df_pases = df_jugador[df_jugador["code"] == "Pases"].copy()
+    df_pases = df_jugador[df_jugador["code"] == "Pases"]
     
     if df_pases.empty:
         st.warning("No hay datos de pases disponibles para visualizar en el campo.")
         return
     
-    # Definir función de conversión localmente para evitar errores
-    def convertir_coordenadas_local(x, y):
-        """
-        Convierte coordenadas originales (ej. 240x150) a (120x80),
-        reflejando eje Y.
-        """
-        x_scale = 120 / 240
-        y_scale = 80 / 150
-        x_offset = -5
-        y_offset = -5.333
-
-        x_new = (x + x_offset) * x_scale
-        y_new = (y + y_offset) * y_scale
-        y_new = 80 - y_new  # Invertimos Y
-
-        return x_new, y_new
-    
-    # Crear columnas de coordenadas convertidas usando la función local
-    df_pases["startX_conv"], df_pases["startY_conv"] = zip(*df_pases.apply(
-        lambda row: convertir_coordenadas_local(row["startX"], row["startY"]), axis=1
-    ))
-    
-    # Para TODOS los pases convertimos coordenadas de destino
-    df_pases["endX_conv"], df_pases["endY_conv"] = zip(*df_pases.apply(
-        lambda row: convertir_coordenadas_local(row["endX"], row["endY"]), axis=1
-    ))
-    
+    # Las coordenadas de campo (*_conv) ya vienen calculadas desde la carga del partido
     # Separar pases completados y fallidos
     pases_completados = df_pases[df_pases["Secundary"].notna()]
     pases_fallidos = df_pases[df_pases["Secundary"].isna()]
     
     # Dibujar el campo
-    pitch = Pitch(
-        pitch_type="custom",
-        pitch_length=120,
-        pitch_width=80,
-        line_color="black",
-        pitch_color="#d0f0c0",
-        linewidth=2
-    )
-    fig, ax = pitch.draw(figsize=(16, 11))
-    
-    # Franjas horizontales
-    franja_altura = 80 / 5
-    for i in range(5):
-        if i % 2 == 0:
-            ax.fill_between([0, 120], i * franja_altura, (i + 1) * franja_altura, color="#a0c080", alpha=0.7)
-    
-    fig.set_facecolor("white")
-    
-    # Dibujar pases completados (con líneas rojas)
-    for _, pase in pases_completados.iterrows():
-        # Línea del pase
-        ax.plot(
-            [pase["startX_conv"], pase["endX_conv"]],
-            [pase["startY_conv"], pase["endY_conv"]],
-            color="red", lw=2, alpha=0.7, zorder=1
-        )
-        
-        # Punto de origen
-        ax.scatter(
-            pase["startX_conv"], pase["startY_conv"],
-            color="black", s=100, edgecolors="red", marker="o", zorder=2
-        )
-        
-        # Punto de destino
-        ax.scatter(
-            pase["endX_conv"], pase["endY_conv"],
-            color="black", s=100, edgecolors="red", marker="o", zorder=2
-        )
+    fig, ax = crear_campo()
     
-    # Dibujar pases fallidos (también con líneas pero en negro)
-    for _, pase in pases_fallidos.iterrows():
-        # Línea del pase
-        ax.plot(
-            [pase["startX_conv"], pase["endX_conv"]],
-            [pase["startY_conv"], pase["endY_conv"]],
-            color="black", lw=2, alpha=0.7, zorder=1
-        )
-        
-        # Punto de origen
-        ax.scatter(
-            pase["startX_conv"], pase["startY_conv"],
-            color="white", s=100, edgecolors="black", marker="o", zorder=2
-        )
-        
-        # Punto de destino
-        ax.scatter(
-            pase["endX_conv"], pase["endY_conv"],
-            color="white", s=100, edgecolors="black", marker="o", zorder=2
-        )
+    # Dibujar pases completados (líneas rojas) y fallidos (líneas negras) con sus puntos de origen y destino
+    for pases, color_linea, color_punto in [(pases_completados, "red", "black"), (pases_fallidos, "black", "white")]:
+        x0, y0 = pases["startX_conv"].to_numpy("float64"), pases["startY_conv"].to_numpy("float64")
+        x1, y1 = pases["endX_conv"].to_numpy("float64"), pases["endY_conv"].to_numpy("float64")
+        dibujar_lineas(ax, x0, y0, x1, y1, color_linea, zorder=1)
+        dibujar_puntos(ax, np.concatenate([x0, x1]), np.concatenate([y0, y1]), color_punto, 100,
+                       bordes=color_linea, zorder=2)
     
     # Agregar leyenda
     from matplotlib.lines import Line2D
@@ -224,7 +152,7 @@ def visualizar_pases_campo(df_jugador):
     ax.legend(handles=leyenda_elementos, loc='upper right', fontsize=10)
     
     # Añadir título
-    plt.suptitle("Visualización de Pases en el Campo", color="black", fontsize=20)
+    fig.suptitle("Visualización de Pases en el Campo", color="black", fontsize=20)
     
     # Añadir información sobre total de pases
     total_completados = len(pases_completados)
@@ -233,14 +161,16 @@ def visualizar_pases_campo(df_jugador):
     
     # Agregar texto con estadísticas
     stats_text = f"Pases completados: {total_completados} ({precision:.1f}%)\nPases fallidos: {total_fallidos}"
-    plt.figtext(0.5, 0.01, stats_text, ha="center", fontsize=12, bbox=dict(facecolor='white', alpha=0.8, edgecolor='black'))
-    
-    st.pyplot(fig)
+    fig.text(0.5, 0.01, stats_text, ha="center", fontsize=12, bbox=dict(facecolor='white', alpha=0.8, edgecolor='black'))
     
-    # Para capturar este gráfico para el PDF, guardarlo en un buffer
+    # Para capturar este gráfico para el PDF, guardarlo en un buffer antes de mostrarlo
+    # (st.pyplot vacía la figura al terminar)
     buf = io.BytesIO()
-    plt.savefig(buf, format='png', bbox_inches='tight')
+    fig.savefig(buf, format='png', bbox_inches='tight')
     buf.seek(0)
+    
+    st.pyplot(fig)
+    plt.close(fig)
     return base64.b64encode(buf.getvalue()).decode('utf-8')  # Retornamos el gráfico en base64
 
 def dibujar_campo_futbol(fig):
@@ -358,68 +288,37 @@ def dibujar_campo_futbol(fig):
         scaleratio=1
     )
 
-# Función para convertir las coordenadas (asegurando que esta función esté disponible)
-def convertir_coordenadas_reflejado(x, y):
-    """
-    Convierte coordenadas originales (ej. 240x150) a (120x80),
-    reflejando eje Y.
-    """
-    x_scale = 120 / 240
-    y_scale = 80 / 150
-    x_offset = -5
-    y_offset = -5.333
-
-    x_new = (x + x_offset) * x_scale
-    y_new = (y + y_offset) * y_scale
-    y_new = 80 - y_new  # Invertimos Y
-
-    return x_new, y_new
-
 # Función para mostrar estadísticas de portero
-def mostrar_estadisticas_portero(df, df_jugador, jugador_seleccionado, info_jugador, minutos_jugados):
+def mostrar_estadisticas_portero(df, df_jugador, jugador_seleccionado, info_jugador, minutos_jugados, periodo=None):
     """
     Muestra estadísticas específicas para porteros, incluyendo paradas, goles recibidos, etc.
+    Los tiros recibidos son los del rival con el portero en el campo (resumen precalculado del partido).
     """
     st.markdown('<div class="section-header">Estadísticas del Portero</div>', unsafe_allow_html=True)
     
-    # Encontrar datos del rival
-    df_rival = None
-    equipo_rival_nombre = None
-    
-    # Buscar el equipo rival en el DataFrame
-    equipos_unicos = df["Team"].unique().tolist()
-    for equipo in equipos_unicos:
-        if equipo != "Valencia" and isinstance(equipo, str):
-            equipo_rival_nombre = equipo
-            df_rival = df[df["Team"] == equipo]
-            break
-    
-    if df_rival is None or df_rival.empty:
+    resumen_rival = obtener_artefacto(df, "tiros_rival")
+    if resumen_rival["rival"] is None:
         st.warning("No se encontraron datos del equipo rival para analizar el rendimiento del portero.")
         return
     
-    # Finalizaciones del equipo rival
-    df_rival_finalizaciones = df_rival[df_rival["code"] == "Finalizaciones"]
-    finalizaciones_totales = len(df_rival_finalizaciones)
-    
-    # Goles recibidos
-    goles_recibidos = df_rival_finalizaciones[df_rival_finalizaciones["text"] == "Gol"].shape[0]
-    
-    # Tiros a puerta y fuera
-    tiros_puerta = df_rival_finalizaciones[df_rival_finalizaciones["group"] == "A puerta"].shape[0]
-    tiros_fuera = df_rival_finalizaciones[df_rival_finalizaciones["group"] == "Fuera"].shape[0]
+    # Finalizaciones del rival con el portero en el campo
+    tiros = tiros_recibidos(resumen_rival, jugador_seleccionado, periodo)
+    finalizaciones_totales = tiros["finalizaciones_recibidas"]
+    goles_recibidos = tiros["goles_recibidos"]
+    tiros_puerta = tiros["tiros_recibidos_puerta"]
+    tiros_fuera = tiros["tiros_recibidos_fuera"]
     
     # Paradas (tiros a puerta - goles)
-    paradas = max(0, tiros_puerta - goles_recibidos)
+    paradas = tiros["paradas"]
     
     # Porcentaje de paradas
     porcentaje_paradas = round((paradas / tiros_puerta * 100), 1) if tiros_puerta > 0 else 0
     
-    # Estadísticas del portero en pases
-    df_pases = df_jugador[df_jugador["code"] == "Pases"]
-    pases_totales = len(df_pases)
-    pases_completados = df_pases["Secundary"].notna().sum()
-    pases_fallados = pases_totales - pases_completados
+    # Estadísticas del portero en pases (cubo de conteos precalculado)
+    estadisticas = obtener_estadisticas_jugador(df, jugador_seleccionado, periodo)
+    pases_completados = estadisticas["pases_completados"]
+    pases_fallados = estadisticas["pases_fallados"]
+    pases_totales = pases_completados + pases_fallados
     precision_pases = round((pases_completados / pases_totales * 100), 1) if pases_totales > 0 else 0
     
     # Métricas clave
@@ -691,10 +590,10 @@ def mostrar_estadisticas_portero(df, df_jugador, jugador_seleccionado, info_juga
     st.markdown('<div class="section-header">Análisis de Tiros Recibidos</div>', unsafe_allow_html=True)
     
     with st.expander("Ver detalles de finalizaciones recibidas"):
+        df_rival_finalizaciones = detalle_tiros(resumen_rival, jugador_seleccionado, periodo)
         if not df_rival_finalizaciones.empty:
             # Simplificar el dataframe para mostrar solo columnas relevantes
-            cols_to_show = ["Periodo", "Mins", "code", "group", "Player", "text"]
-            df_to_show = df_rival_finalizaciones[cols_to_show].copy()
+            df_to_show = df_rival_finalizaciones.copy()
             
             # Renombrar columnas para mejor legibilidad
             df_to_show = df_to_show.rename(columns={
@@ -1468,6 +1367,528 @@ def generar_pdf_html_portero(jugador_seleccionado, info_jugador, minutos_jugados
     
     return pdf
 
+# Función para mostrar el análisis del jugador seleccionado. Es un fragmento: al cambiar
+# el jugador o el periodo solo se vuelve a ejecutar esta parte, sin recargar la página
+@st.fragment
+def mostrar_analisis_individual(df):
+    try:
+        # Filtrar solo datos del Valencia
+        df_valencia = df[df["Team"] == "Valencia"]
+        
+        # Filtrar jugadores - solo queremos jugadores reales (excluyendo "Valencia" y valores NaN)
+        jugadores = []
+        for jugador in df_valencia["Player"].unique():
+            if jugador != "Valencia" and isinstance(jugador, str) and pd.notna(jugador):
+                jugadores.append(jugador)
+        
+        # Ordenar jugadores (todos son string ahora)
+        jugadores.sort()
+        
+        # Panel de control con estilo mejorado
+        st.markdown('<div class="player-selector">', unsafe_allow_html=True)
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Seleccionar un jugador para analizar
+            jugador_seleccionado = st.selectbox("Jugador", jugadores)
+        
+        with col2:
+            periodos = sorted(df_valencia["Periodo"].unique().tolist())
+            opciones_periodo = ["Todos"] + [f"Periodo {p}" for p in periodos]
+            periodo_seleccionado = st.selectbox("Periodo", opciones_periodo, key="periodo_stats")
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        # Filtrar por periodo si se seleccionó uno específico
+        df_filtrado = df_valencia.copy()
+        periodo_num = None
+        if periodo_seleccionado != "Todos":
+            periodo_num = int(periodo_seleccionado.split(" ")[1])
+            df_filtrado = df_filtrado[df_filtrado["Periodo"] == periodo_num]
+        
+        # Filtrar datos del jugador seleccionado
+        df_jugador = df_filtrado[df_filtrado["Player"] == jugador_seleccionado]
+        
+        if len(df_jugador) == 0:
+            st.warning(f"No hay datos disponibles para {jugador_seleccionado} en el periodo seleccionado.")
+            return
+        
+        # Buscar jugador en la plantilla
+        info_jugador = encontrar_jugador_plantilla(jugador_seleccionado)
+        
+        # Extraer nombre del jugador si está en formato "#. Nombre"
+        jugador_nombre = jugador_seleccionado
+        if ". " in jugador_seleccionado:
+            partes = jugador_seleccionado.split(". ", 1)
+            if len(partes) == 2:
+                jugador_nombre = partes[1]
+        
+        # Obtener minutos jugados: M.J del acta o estimación (tabla precalculada del partido)
+        minutos_jugados = obtener_minutos_jugados(df, jugador_seleccionado, periodo_num)
+        
+        # Cabecera de jugador con foto de la plantilla
+        if info_jugador:
+            # Obtener foto del jugador
+            ruta_foto = obtener_foto_jugador(info_jugador.get("id"))
+            foto_html = ""
+            
+            if ruta_foto and os.path.exists(ruta_foto):
+                # Leer la imagen y convertirla a base64
+                with open(ruta_foto, "rb") as img_file:
+                    img_bytes = img_file.read()
+                    img_base64 = base64.b64encode(img_bytes).decode()
+                
+                foto_html = f'<img src="data:image/png;base64,{img_base64}" class="player-photo" alt="{info_jugador.get("nombre", "")}">'
+            else:
+                # Si no hay foto, mostrar un círculo con iniciales
+                iniciales = "".join([n[0] for n in info_jugador.get("nombre", jugador_nombre)[0:2].upper()])
+                foto_html = f'''
+                <div style="width: 80px; height: 80px; border-radius: 50%; background-color: #ff6600; 
+                display: flex; align-items: center; justify-content: center; font-size: 24px; 
+                font-weight: bold; color: white; margin-right: 20px;">{iniciales}</div>
+                '''
+            
+            # Crear tarjeta del jugador
+            st.markdown(f'''
+            <div class="player-card">
+                {foto_html}
+                <div class="player-info">
+                    <div class="player-name">{info_jugador.get("nombre", "")} {info_jugador.get("apellidos", "")}</div>
+                    <div class="player-team">Valencia CF</div>
+                    <div class="player-position">{info_jugador.get("posicion", "")}</div>
+                </div>
+            </div>
+            ''', unsafe_allow_html=True)
+        else:
+            # Si no hay información en la plantilla, mostrar información básica
+            # Extraer número y nombre del jugador si está en formato "#. Nombre"
+            jugador_nombre = jugador_seleccionado
+            jugador_numero = ""
+            if ". " in jugador_seleccionado:
+                partes = jugador_seleccionado.split(". ", 1)
+                if len(partes) == 2:
+                    jugador_numero = partes[0]
+                    jugador_nombre = partes[1]
+            
+            foto_html = f"""
+            <div style="width: 80px; height: 80px; border-radius: 50%; background-color: #ff6600; 
+                display: flex; align-items: center; justify-content: center; font-size: 24px; 
+                font-weight: bold; color: white; margin-right: 20px;">
+                {jugador_numero if jugador_numero else jugador_nombre[0:2].upper()}
+            </div>
+            """
+            
+            st.markdown(f"""
+            <div class="player-card">
+                {foto_html}
+                <div class="player-info">
+                    <div class="player-name">{jugador_nombre}</div>
+                    <div class="player-team">Valencia CF</div>
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Determinar si es portero
+        es_portero = False
+        
+        # Verificar en info_jugador (si está en la plantilla)
+        if info_jugador:
+            # Si tenemos info del jugador en la plantilla, usamos EXCLUSIVAMENTE su posición registrada
+            posicion = info_jugador.get("posicion", "").lower()
+            es_portero = any(palabra in posicion for palabra in ["portero", "goalkeeper", "arquero", "porter"])
+        else:
+            # SOLO si no está en la plantilla, intentamos inferir si es portero por su nombre
+            porteros_conocidos = ["mamardashvili", "jaume", "domenech", "cillessen", "herrera", "jimenez", "raul"]
+            for nombre in porteros_conocidos:
+                if nombre in jugador_nombre.lower():
+                    # Comprobación adicional: verificar si hay datos de portero
+                    # (esto ayuda a evitar falsos positivos)
+                    es_portero = tiros_recibidos(obtener_artefacto(df, "tiros_rival"))["finalizaciones_recibidas"] > 0
+                    break
+        
+        # Mostrar estadísticas según si es portero o jugador de campo
+        if es_portero:
+            # Mostrar estadísticas específicas de portero
+            mostrar_estadisticas_portero(df, df_jugador, jugador_seleccionado, info_jugador, minutos_jugados, periodo_num)
+        else:
+            # Calcular estadísticas para jugador de campo (cubo de conteos precalculado)
+            estadisticas = obtener_estadisticas_jugador(df, jugador_seleccionado, periodo_num)
+            total_acciones = estadisticas["total_acciones"]
+            
+            # 1. Estadísticas de pases
+            pases_completados = estadisticas["pases_completados"]
+            pases_fallados = estadisticas["pases_fallados"]
+            pases_totales = pases_completados + pases_fallados
+            precision_pases = (pases_completados/pases_totales*100) if pases_totales > 0 else 0
+            
+            # 2. Estadísticas de finalizaciones
+            finalizaciones_totales = estadisticas["finalizaciones"]
+            
+            # Calcular goles, tiros a puerta y fuera
+            goles = estadisticas["goles"]
+            tiros_puerta = estadisticas["tiros_puerta"]
+            tiros_fuera = estadisticas["tiros_fuera"]
+            
+            # 3. Estadísticas de faltas
+            faltas = estadisticas["faltas"]
+            
+            # 4. Estadísticas de recuperaciones
+            recuperaciones = estadisticas["recuperaciones"]
+            
+            # 5. Otras estadísticas
+            encontrar_profundidad = estadisticas["profundidad"]
+            encontrar_cara = estadisticas["cara"]
+            atacar_area = estadisticas["area"]
+            
+            # Tarjetas de métricas clave (estilo de LaLiga)
+            st.markdown('<div class="section-header">Métricas Clave</div>', unsafe_allow_html=True)
+            
+            # Primera fila de métricas - Añadimos M.J.
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                st.markdown(f"""
+                <div class="metric-container">
+                    <div class="metric-title">Minutos Jugados (M.J.)</div>
+                    <div class="metric-value">{minutos_jugados}</div>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            with col2:
+                st.markdown(f"""
+                <div class="metric-container">
+                    <div class="metric-title">Pases Completados</div>
+                    <div class="metric-value">{pases_completados}</div>
+                    <div style="font-size: 14px;">{precision_pases:.1f}% de precisión</div>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            with col3:
+                st.markdown(f"""
+                <div class="metric-container">
+                    <div class="metric-title">Finalizaciones</div>
+                    <div class="metric-value">{finalizaciones_totales}</div>
+                    <div style="font-size: 14px;">{goles} gol{'es' if goles != 1 else ''}</div>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            with col4:
+                # Calcular un índice de rendimiento
+                indice_rendimiento = (
+                    pases_completados * 0.1 + 
+                    goles * 3 + 
+                    tiros_puerta * 0.5 + 
+                    recuperaciones * 0.5 - 
+                    faltas * 0.2 + 
+                    (pases_fallados * -0.05) +
+                    encontrar_profundidad * 0.2 +
+                    encontrar_cara * 0.1 +
+                    atacar_area * 0.3
+                )
+                
+                st.markdown(f"""
+                <div class="metric-container">
+                    <div class="metric-title">Índice Rendimiento</div>
+                    <div class="metric-value">{indice_rendimiento:.1f}</div>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            # Segunda fila de métricas
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                st.markdown(f"""
+                <div class="metric-container">
+                    <div class="metric-title">Pases Fallados</div>
+                    <div class="metric-value">{pases_fallados}</div>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            with col2:
+                st.markdown(f"""
+                <div class="metric-container">
+                    <div class="metric-title">Encontrar Futbolista</div>
+                    <div class="metric-value">{encontrar_profundidad + encontrar_cara}</div>
+                    <div style="font-size: 14px;">{encontrar_profundidad} en profundidad</div>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            with col3:
+                st.markdown(f"""
+                <div class="metric-container">
+                    <div class="metric-title">Atacar el área</div>
+                    <div class="metric-value">{atacar_area}</div>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            with col4:
+                st.markdown(f"""
+                <div class="metric-container">
+                    <div class="metric-title">Faltas Cometidas</div>
+                    <div class="metric-value">{faltas}</div>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            # Área de visualización con gráficos profesionales
+            st.markdown('<div class="section-header">Visualización de Rendimiento</div>', unsafe_allow_html=True)
+            
+            charts = {}  # Diccionario para almacenar gráficos para el PDF
+            
+            # Diseño de dos columnas para gráficos principales
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                # Gráfico de distribución de pases estilo profesional
+                if pases_totales > 0:
+                    fig_pases = go.Figure()
+                    fig_pases.add_trace(go.Pie(
+                        labels=['Completados', 'Fallados'],
+                        values=[pases_completados, pases_fallados],
+                        hole=0.6,
+                        marker=dict(colors=['#4CAF50', '#E57373']),
+                        textinfo='percent+value',
+                        insidetextorientation='radial',
+                        pull=[0.05, 0],
+                        rotation=90
+                    ))
+                    
+                    fig_pases.update_layout(
+                        title={
+                            'text': "Distribución de Pases",
+                            'y':0.95,
+                            'x':0.5,
+                            'xanchor': 'center',
+                            'yanchor': 'top',
+                            'font': dict(size=16, color='#1a5276')
+                        },
+                        annotations=[dict(
+                            text=f"{precision_pases:.1f}%<br>precisión",
+                            x=0.5, y=0.5,
+                            font=dict(size=16, color='#1a5276'),
+                            showarrow=False
+                        )],
+                        showlegend=True,
+                        legend=dict(
+                            orientation="h",
+                            yanchor="bottom",
+                            y=-0.2,
+                            xanchor="center",
+                            x=0.5
+                        ),
+                        margin=dict(l=20, r=20, t=60, b=20),
+                        paper_bgcolor='white',
+                        plot_bgcolor='white'
+                    )
+                    
+                    st.plotly_chart(fig_pases, use_container_width=True)
+                    
+                    # Capturar gráfico para PDF
+                    try:
+                        charts['distribucion_pases'] = capturar_graficos_plotly(fig_pases)
+                    except Exception as e:
+                        st.warning(f"No se pudo capturar el gráfico de pases: {str(e)}")
+                else:
+                    st.info("No hay datos de pases disponibles para este jugador.")
+            
+            with col2:
+                # Gráfico de finalizaciones con diseño profesional
+                if finalizaciones_totales > 0:
+                    # Crea un gráfico de anillos personalizado para finalizaciones
+                    fig_fin = go.Figure()
+                    
+                    # Colores para diferentes tipos de tiros
+                    colores_tiros = ['#4CAF50', '#2196F3', '#FF9800']
+                    
+                    # Valores para goles, a puerta (sin gol) y fuera
+                    valores_tiros = [goles, tiros_puerta - goles, tiros_fuera]
+                    etiquetas_tiros = ['Goles', 'A puerta', 'Fuera']
+                    
+                    fig_fin.add_trace(go.Pie(
+                        labels=etiquetas_tiros,
+                        values=valores_tiros,
+                        hole=0.6,
+                        marker=dict(colors=colores_tiros),
+                        textinfo='percent+value',
+                        insidetextorientation='radial',
+                        pull=[0.1, 0, 0]
+                    ))
+                    
+                    # Calcular porcentaje de acierto (goles/finalizaciones)
+                    porcentaje_acierto = (goles / finalizaciones_totales * 100) if finalizaciones_totales > 0 else 0
+                    
+                    fig_fin.update_layout(
+                        title={
+                            'text': "Finalizaciones",
+                            'y':0.95,
+                            'x':0.5,
+                            'xanchor': 'center',
+                            'yanchor': 'top',
+                            'font': dict(size=16, color='#1a5276')
+                        },
+                        annotations=[dict(
+                            text=f"{porcentaje_acierto:.1f}%<br>efectividad",
+                            x=0.5, y=0.5,
+                            font=dict(size=16, color='#1a5276'),
+                            showarrow=False
+                        )],
+                        showlegend=True,
+                        legend=dict(
+                            orientation="h",
+                            yanchor="bottom",
+                            y=-0.2,
+                            xanchor="center",
+                            x=0.5
+                        ),
+                        margin=dict(l=20, r=20, t=60, b=20),
+                        paper_bgcolor='white',
+                        plot_bgcolor='white'
+                    )
+                    
+                    st.plotly_chart(fig_fin, use_container_width=True)
+                    
+                    # Capturar gráfico para PDF
+                    try:
+                        charts['finalizaciones_chart'] = capturar_graficos_plotly(fig_fin)
+                    except Exception as e:
+                        st.warning(f"No se pudo capturar el gráfico de finalizaciones: {str(e)}")
+                else:
+                    st.info("No hay datos de finalizaciones disponibles para este jugador.")
+            
+            # Gráfico de barras de resumen
+            st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+            
+            # Crear un dataframe para el gráfico de barras por tipo de acción
+            tipos_acciones = {
+                'M.J.': minutos_jugados,  # Añadimos M.J. al resumen
+                'Pases Completados': pases_completados,
+                'Pases Fallados': pases_fallados,
+                'Tiros a Puerta': tiros_puerta,
+                'Tiros Fuera': tiros_fuera,
+                'Recuperaciones': recuperaciones,
+                'Faltas': faltas,
+                'Futbolista en Profundidad': encontrar_profundidad,
+                'Futbolista de Cara': encontrar_cara,
+                'Atacar el área': atacar_area
+            }
+            
+            df_acciones = pd.DataFrame({
+                'Tipo': list(tipos_acciones.keys()),
+                'Cantidad': list(tipos_acciones.values())
+            })
+            
+            # Ordenar por cantidad (descendente)
+            df_acciones = df_acciones.sort_values('Cantidad', ascending=False)
+            
+            # Asignar colores según tipo de acción (estilo LaLiga)
+            colores_acciones = {
+                'M.J.': '#1E88E5',  # Color para M.J.
+                'Pases Completados': '#4CAF50',
+                'Pases Fallados': '#E57373',
+                'Tiros a Puerta': '#2196F3',
+                'Tiros Fuera': '#FF9800',
+                'Recuperaciones': '#9C27B0',
+                'Faltas': '#F44336',
+                'Futbolista en Profundidad': '#00BCD4',
+                'Futbolista de Cara': '#3F51B5',
+                'Atacar el área': '#FFC107'
+            }
+            
+            colores_barras = [colores_acciones.get(tipo, '#757575') for tipo in df_acciones['Tipo']]
+            
+            # Crear gráfico de barras con estilo profesional
+            fig_acciones = go.Figure()
+            
+            fig_acciones.add_trace(go.Bar(
+                x=df_acciones['Tipo'],
+                y=df_acciones['Cantidad'],
+                marker_color=colores_barras,
+                text=df_acciones['Cantidad'],
+                textposition='auto'
+            ))
+            
+            fig_acciones.update_layout(
+                title={
+                    'text': "Resumen de Acciones",
+                    'y':0.95,
+                    'x':0.5,
+                    'xanchor': 'center',
+                    'yanchor': 'top',
+                    'font': dict(size=18, color='#1a5276')
+                },
+                xaxis=dict(
+                    title='',
+                    tickangle=-45,
+                    tickfont=dict(size=12)
+                ),
+                yaxis=dict(
+                    title='',
+                    gridcolor='#eee',
+                    zerolinecolor='#eee'
+                ),
+                plot_bgcolor='white',
+                paper_bgcolor='white',
+                height=450,
+                margin=dict(l=40, r=40, t=60, b=80)
+            )
+            
+            st.plotly_chart(fig_acciones, use_container_width=True)
+            
+            # Capturar gráfico para PDF
+            try:
+                charts['resumen_acciones'] = capturar_graficos_plotly(fig_acciones)
+            except Exception as e:
+                st.warning(f"No se pudo capturar el gráfico de resumen: {str(e)}")
+            
+            st.markdown('</div>', unsafe_allow_html=True)
+
+            # Nueva sección: Visualización de pases en el campo
+            st.markdown('<div class="section-header">Mapa de Pases en el Campo</div>', unsafe_allow_html=True)
+            st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+            
+            # Llamar a la función que visualiza los pases en el campo
+            mapa_pases_base64 = visualizar_pases_campo(df_jugador)
+            
+            # Guardar imagen para PDF
+            if mapa_pases_base64:
+                charts['mapa_pases'] = mapa_pases_base64
+            
+            st.markdown('</div>', unsafe_allow_html=True)
+            
+            # Sección para exportar a PDF
+            st.markdown('<div class="section-header">Exportar Análisis</div>', unsafe_allow_html=True)
+            
+            # Si hay foto del jugador, capturarla
+            if info_jugador:
+                ruta_foto = obtener_foto_jugador(info_jugador.get("id"))
+                if ruta_foto and os.path.exists(ruta_foto):
+                    with open(ruta_foto, "rb") as img_file:
+                        charts['foto_jugador'] = base64.b64encode(img_file.read()).decode()
+            
+            # Generar el PDF con HTML/CSS
+            pdf_data = generar_pdf_html(
+                jugador_seleccionado,
+                info_jugador,
+                minutos_jugados,
+                pases_completados,
+                precision_pases,
+                pases_fallados,
+                finalizaciones_totales,
+                goles,
+                encontrar_profundidad,
+                encontrar_cara,
+                atacar_area,
+                faltas,
+                indice_rendimiento,
+                charts
+            )
+            
+            # Botón para descargar
+            nombre_archivo = f"{jugador_seleccionado.replace(' ', '_')}_analisis.pdf"
+            st.markdown(crear_boton_descargar_pdf(pdf_data, nombre_archivo), unsafe_allow_html=True)
+    except Exception as e:
+        st.error(f"Error al procesar el archivo: {str(e)}")
+        import traceback
+        st.code(traceback.format_exc())
+
 def pagina_registros_individuales():
     # Aplicar estilo profesional con CSS personalizado
     st.markdown("""
@@ -1596,548 +2017,10 @@ def pagina_registros_individuales():
         
         try:
             # Cargar el archivo Excel
-            df = pd.read_excel(ruta_archivo)
+            df = cargar_partido(ruta_archivo)
             
-            # Filtrar solo datos del Valencia
-            df_valencia = df[df["Team"] == "Valencia"]
-            
-            # Filtrar jugadores - solo queremos jugadores reales (excluyendo "Valencia" y valores NaN)
-            jugadores = []
-            for jugador in df_valencia["Player"].unique():
-                if jugador != "Valencia" and isinstance(jugador, str) and pd.notna(jugador):
-                    jugadores.append(jugador)
-            
-            # Ordenar jugadores (todos son string ahora)
-            jugadores.sort()
-            
-            # Panel de control con estilo mejorado
-            st.markdown('<div class="player-selector">', unsafe_allow_html=True)
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Seleccionar un jugador para analizar
-                jugador_seleccionado = st.selectbox("Jugador", jugadores)
-            
-            with col2:
-                periodos = sorted(df_valencia["Periodo"].unique().tolist())
-                opciones_periodo = ["Todos"] + [f"Periodo {p}" for p in periodos]
-                periodo_seleccionado = st.selectbox("Periodo", opciones_periodo, key="periodo_stats")
-            st.markdown('</div>', unsafe_allow_html=True)
-            
-            # Filtrar por periodo si se seleccionó uno específico
-            df_filtrado = df_valencia.copy()
-            if periodo_seleccionado != "Todos":
-                periodo_num = int(periodo_seleccionado.split(" ")[1])
-                df_filtrado = df_filtrado[df_filtrado["Periodo"] == periodo_num]
-            
-            # Filtrar datos del jugador seleccionado
-            df_jugador = df_filtrado[df_filtrado["Player"] == jugador_seleccionado]
-            
-            if len(df_jugador) == 0:
-                st.warning(f"No hay datos disponibles para {jugador_seleccionado} en el periodo seleccionado.")
-                return
-            
-            # Buscar jugador en la plantilla
-            info_jugador = encontrar_jugador_plantilla(jugador_seleccionado)
-            
-            # Extraer nombre del jugador si está en formato "#. Nombre"
-            jugador_nombre = jugador_seleccionado
-            if ". " in jugador_seleccionado:
-                partes = jugador_seleccionado.split(". ", 1)
-                if len(partes) == 2:
-                    jugador_nombre = partes[1]
-            
-            # Obtener minutos jugados
-            minutos_jugados = None
-            # Buscar en las filas donde Jugadores y M.J contienen la información
-            jugador_mj_info = df[(df["Jugadores"] == jugador_seleccionado) & pd.notna(df["M.J"])]
-            if not jugador_mj_info.empty:
-                # Usar el valor de M.J cuando el jugador aparece en la columna Jugadores
-                minutos_jugados = int(jugador_mj_info["M.J"].iloc[0])
-            else:
-                # Intentar buscar con otro formato o nombre parcial si no se encuentra exacto
-                for idx, row in df.iterrows():
-                    if pd.notna(row.get("Jugadores")) and pd.notna(row.get("M.J")):
-                        if jugador_nombre in str(row["Jugadores"]) or str(row["Jugadores"]) in jugador_seleccionado:
-                            minutos_jugados = int(row["M.J"])
-                            break
-                            
-            # Si no pudimos obtener M.J, calculamos una estimación
-            if minutos_jugados is None:
-                # Calcular minutos jugados basados en Mins
-                periodos_jugados = df_jugador["Periodo"].unique()
-                minutos_jugados = 0
-                for periodo in periodos_jugados:
-                    mins_periodo = df_jugador[df_jugador["Periodo"] == periodo]["Mins"]
-                    if not mins_periodo.empty:
-                        minutos_jugados += (max(mins_periodo) - min(mins_periodo) + 1)
-            
-            # Cabecera de jugador con foto de la plantilla
-            if info_jugador:
-                # Obtener foto del jugador
-                ruta_foto = obtener_foto_jugador(info_jugador.get("id"))
-                foto_html = ""
-                
-                if ruta_foto and os.path.exists(ruta_foto):
-                    # Leer la imagen y convertirla a base64
-                    with open(ruta_foto, "rb") as img_file:
-                        img_bytes = img_file.read()
-                        img_base64 = base64.b64encode(img_bytes).decode()
-                    
-                    foto_html = f'<img src="data:image/png;base64,{img_base64}" class="player-photo" alt="{info_jugador.get("nombre", "")}">'
-                else:
-                    # Si no hay foto, mostrar un círculo con iniciales
-                    iniciales = "".join([n[0] for n in info_jugador.get("nombre", jugador_nombre)[0:2].upper()])
-                    foto_html = f'''
-                    <div style="width: 80px; height: 80px; border-radius: 50%; background-color: #ff6600; 
-                    display: flex; align-items: center; justify-content: center; font-size: 24px; 
-                    font-weight: bold; color: white; margin-right: 20px;">{iniciales}</div>
-                    '''
-                
-                # Crear tarjeta del jugador
-                st.markdown(f'''
-                <div class="player-card">
-                    {foto_html}
-                    <div class="player-info">
-                        <div class="player-name">{info_jugador.get("nombre", "")} {info_jugador.get("apellidos", "")}</div>
-                        <div class="player-team">Valencia CF</div>
-                        <div class="player-position">{info_jugador.get("posicion", "")}</div>
-                    </div>
-                </div>
-                ''', unsafe_allow_html=True)
-            else:
-                # Si no hay información en la plantilla, mostrar información básica
-                # Extraer número y nombre del jugador si está en formato "#. Nombre"
-                jugador_nombre = jugador_seleccionado
-                jugador_numero = ""
-                if ". " in jugador_seleccionado:
-                    partes = jugador_seleccionado.split(". ", 1)
-                    if len(partes) == 2:
-                        jugador_numero = partes[0]
-                        jugador_nombre = partes[1]
-                
-                foto_html = f"""
-                <div style="width: 80px; height: 80px; border-radius: 50%; background-color: #ff6600; 
-                    display: flex; align-items: center; justify-content: center; font-size: 24px; 
-                    font-weight: bold; color: white; margin-right: 20px;">
-                    {jugador_numero if jugador_numero else jugador_nombre[0:2].upper()}
-                </div>
-                """
-                
-                st.markdown(f"""
-                <div class="player-card">
-                    {foto_html}
-                    <div class="player-info">
-                        <div class="player-name">{jugador_nombre}</div>
-                        <div class="player-team">Valencia CF</div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Determinar si es portero
-            es_portero = False
-            
-            # Verificar en info_jugador (si está en la plantilla)
-            if info_jugador:
-                # Si tenemos info del jugador en la plantilla, usamos EXCLUSIVAMENTE su posición registrada
-                posicion = info_jugador.get("posicion", "").lower()
-                es_portero = any(palabra in posicion for palabra in ["portero", "goalkeeper", "arquero", "porter"])
-            else:
-                # SOLO si no está en la plantilla, intentamos inferir si es portero por su nombre
-                porteros_conocidos = ["mamardashvili", "jaume", "domenech", "cillessen", "herrera", "jimenez", "raul"]
-                for nombre in porteros_conocidos:
-                    if nombre in jugador_nombre.lower():
-                        # Comprobación adicional: verificar si hay datos de portero
-                        # (esto ayuda a evitar falsos positivos)
-                        for equipo in df["Team"].unique().tolist():
-                            if equipo != "Valencia" and isinstance(equipo, str):
-                                df_rival = df[df["Team"] == equipo]
-                                df_rival_finalizaciones = df_rival[df_rival["code"] == "Finalizaciones"]
-                                if len(df_rival_finalizaciones) > 0:
-                                    es_portero = True
-                                    break
-                        break
-            
-            # Mostrar estadísticas según si es portero o jugador de campo
-            if es_portero:
-                # Mostrar estadísticas específicas de portero
-                mostrar_estadisticas_portero(df, df_jugador, jugador_seleccionado, info_jugador, minutos_jugados)
-            else:
-                # Calcular estadísticas para jugador de campo
-                total_acciones = len(df_jugador)
-                
-                # 1. Estadísticas de pases
-                df_pases = df_jugador[df_jugador["code"] == "Pases"]
-                pases_totales = len(df_pases)
-                pases_completados = df_pases["Secundary"].notna().sum()
-                pases_fallados = pases_totales - pases_completados
-                precision_pases = (pases_completados/pases_totales*100) if pases_totales > 0 else 0
-                
-                # 2. Estadísticas de finalizaciones
-                df_finalizaciones = df_jugador[df_jugador["code"] == "Finalizaciones"]
-                finalizaciones_totales = len(df_finalizaciones)
-                
-                # Calcular goles, tiros a puerta y fuera
-                goles = df_finalizaciones[df_finalizaciones["text"] == "Gol"].shape[0]
-                tiros_puerta = df_finalizaciones[df_finalizaciones["group"] == "A puerta"].shape[0]
-                tiros_fuera = df_finalizaciones[df_finalizaciones["group"] == "Fuera"].shape[0]
-                
-                # 3. Estadísticas de faltas
-                faltas = df_jugador[df_jugador["code"] == "Faltas"].shape[0]
-                
-                # 4. Estadísticas de recuperaciones
-                recuperaciones = df_jugador[df_jugador["code"] == "Recuperaciones"].shape[0]
-                
-                # 5. Otras estadísticas
-                encontrar_profundidad = df_jugador[df_jugador["code"] == "Encontrar Futbolista en profundidad"].shape[0]
-                encontrar_cara = df_jugador[df_jugador["code"] == "Encontrar Futbolista de cara"].shape[0]
-                atacar_area = df_jugador[df_jugador["code"] == "Atacar el área"].shape[0]
-                
-                # Tarjetas de métricas clave (estilo de LaLiga)
-                st.markdown('<div class="section-header">Métricas Clave</div>', unsafe_allow_html=True)
-                
-                # Primera fila de métricas - Añadimos M.J.
-                col1, col2, col3, col4 = st.columns(4)
-                
-                with col1:
-                    st.markdown(f"""
-                    <div class="metric-container">
-                        <div class="metric-title">Minutos Jugados (M.J.)</div>
-                        <div class="metric-value">{minutos_jugados}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with col2:
-                    st.markdown(f"""
-                    <div class="metric-container">
-                        <div class="metric-title">Pases Completados</div>
-                        <div class="metric-value">{pases_completados}</div>
-                        <div style="font-size: 14px;">{precision_pases:.1f}% de precisión</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with col3:
-                    st.markdown(f"""
-                    <div class="metric-container">
-                        <div class="metric-title">Finalizaciones</div>
-                        <div class="metric-value">{finalizaciones_totales}</div>
-                        <div style="font-size: 14px;">{goles} gol{'es' if goles != 1 else ''}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with col4:
-                    # Calcular un índice de rendimiento
-                    indice_rendimiento = (
-                        pases_completados * 0.1 + 
-                        goles * 3 + 
-                        tiros_puerta * 0.5 + 
-                        recuperaciones * 0.5 - 
-                        faltas * 0.2 + 
-                        (pases_fallados * -0.05) +
-                        encontrar_profundidad * 0.2 +
-                        encontrar_cara * 0.1 +
-                        atacar_area * 0.3
-                    )
-                    
-                    st.markdown(f"""
-                    <div class="metric-container">
-                        <div class="metric-title">Índice Rendimiento</div>
-                        <div class="metric-value">{indice_rendimiento:.1f}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                # Segunda fila de métricas
-                col1, col2, col3, col4 = st.columns(4)
-                
-                with col1:
-                    st.markdown(f"""
-                    <div class="metric-container">
-                        <div class="metric-title">Pases Fallados</div>
-                        <div class="metric-value">{pases_fallados}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with col2:
-                    st.markdown(f"""
-                    <div class="metric-container">
-                        <div class="metric-title">Encontrar Futbolista</div>
-                        <div class="metric-value">{encontrar_profundidad + encontrar_cara}</div>
-                        <div style="font-size: 14px;">{encontrar_profundidad} en profundidad</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with col3:
-                    st.markdown(f"""
-                    <div class="metric-container">
-                        <div class="metric-title">Atacar el área</div>
-                        <div class="metric-value">{atacar_area}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with col4:
-                    st.markdown(f"""
-                    <div class="metric-container">
-                        <div class="metric-title">Faltas Cometidas</div>
-                        <div class="metric-value">{faltas}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                # Área de visualización con gráficos profesionales
-                st.markdown('<div class="section-header">Visualización de Rendimiento</div>', unsafe_allow_html=True)
-                
-                charts = {}  # Diccionario para almacenar gráficos para el PDF
-                
-                # Diseño de dos columnas para gráficos principales
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    # Gráfico de distribución de pases estilo profesional
-                    if pases_totales > 0:
-                        fig_pases = go.Figure()
-                        fig_pases.add_trace(go.Pie(
-                            labels=['Completados', 'Fallados'],
-                            values=[pases_completados, pases_fallados],
-                            hole=0.6,
-                            marker=dict(colors=['#4CAF50', '#E57373']),
-                            textinfo='percent+value',
-                            insidetextorientation='radial',
-                            pull=[0.05, 0],
-                            rotation=90
-                        ))
-                        
-                        fig_pases.update_layout(
-                            title={
-                                'text': "Distribución de Pases",
-                                'y':0.95,
-                                'x':0.5,
-                                'xanchor': 'center',
-                                'yanchor': 'top',
-                                'font': dict(size=16, color='#1a5276')
-                            },
-                            annotations=[dict(
-                                text=f"{precision_pases:.1f}%<br>precisión",
-                                x=0.5, y=0.5,
-                                font=dict(size=16, color='#1a5276'),
-                                showarrow=False
-                            )],
-                            showlegend=True,
-                            legend=dict(
-                                orientation="h",
-                                yanchor="bottom",
-                                y=-0.2,
-                                xanchor="center",
-                                x=0.5
-                            ),
-                            margin=dict(l=20, r=20, t=60, b=20),
-                            paper_bgcolor='white',
-                            plot_bgcolor='white'
-                        )
-                        
-                        st.plotly_chart(fig_pases, use_container_width=True)
-                        
-                        # Capturar gráfico para PDF
-                        try:
-                            charts['distribucion_pases'] = capturar_graficos_plotly(fig_pases)
-                        except Exception as e:
-                            st.warning(f"No se pudo capturar el gráfico de pases: {str(e)}")
-                    else:
-                        st.info("No hay datos de pases disponibles para este jugador.")
-                
-                with col2:
-                    # Gráfico de finalizaciones con diseño profesional
-                    if finalizaciones_totales > 0:
-                        # Crea un gráfico de anillos personalizado para finalizaciones
-                        fig_fin = go.Figure()
-                        
-                        # Colores para diferentes tipos de tiros
-                        colores_tiros = ['#4CAF50', '#2196F3', '#FF9800']
-                        
-                        # Valores para goles, a puerta (sin gol) y fuera
-                        valores_tiros = [goles, tiros_puerta - goles, tiros_fuera]
-                        etiquetas_tiros = ['Goles', 'A puerta', 'Fuera']
-                        
-                        fig_fin.add_trace(go.Pie(
-                            labels=etiquetas_tiros,
-                            values=valores_tiros,
-                            hole=0.6,
-                            marker=dict(colors=colores_tiros),
-                            textinfo='percent+value',
-                            insidetextorientation='radial',
-                            pull=[0.1, 0, 0]
-                        ))
-                        
-                        # Calcular porcentaje de acierto (goles/finalizaciones)
-                        porcentaje_acierto = (goles / finalizaciones_totales * 100) if finalizaciones_totales > 0 else 0
-                        
-                        fig_fin.update_layout(
-                            title={
-                                'text': "Finalizaciones",
-                                'y':0.95,
-                                'x':0.5,
-                                'xanchor': 'center',
-                                'yanchor': 'top',
-                                'font': dict(size=16, color='#1a5276')
-                            },
-                            annotations=[dict(
-                                text=f"{porcentaje_acierto:.1f}%<br>efectividad",
-                                x=0.5, y=0.5,
-                                font=dict(size=16, color='#1a5276'),
-                                showarrow=False
-                            )],
-                            showlegend=True,
-                            legend=dict(
-                                orientation="h",
-                                yanchor="bottom",
-                                y=-0.2,
-                                xanchor="center",
-                                x=0.5
-                            ),
-                            margin=dict(l=20, r=20, t=60, b=20),
-                            paper_bgcolor='white',
-                            plot_bgcolor='white'
-                        )
-                        
-                        st.plotly_chart(fig_fin, use_container_width=True)
-                        
-                        # Capturar gráfico para PDF
-                        try:
-                            charts['finalizaciones_chart'] = capturar_graficos_plotly(fig_fin)
-                        except Exception as e:
-                            st.warning(f"No se pudo capturar el gráfico de finalizaciones: {str(e)}")
-                    else:
-                        st.info("No hay datos de finalizaciones disponibles para este jugador.")
-                
-                # Gráfico de barras de resumen
-                st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                
-                # Crear un dataframe para el gráfico de barras por tipo de acción
-                tipos_acciones = {
-                    'M.J.': minutos_jugados,  # Añadimos M.J. al resumen
-                    'Pases Completados': pases_completados,
-                    'Pases Fallados': pases_fallados,
-                    'Tiros a Puerta': tiros_puerta,
-                    'Tiros Fuera': tiros_fuera,
-                    'Recuperaciones': recuperaciones,
-                    'Faltas': faltas,
-                    'Futbolista en Profundidad': encontrar_profundidad,
-                    'Futbolista de Cara': encontrar_cara,
-                    'Atacar el área': atacar_area
-                }
-                
-                df_acciones = pd.DataFrame({
-                    'Tipo': list(tipos_acciones.keys()),
-                    'Cantidad': list(tipos_acciones.values())
-                })
-                
-                # Ordenar por cantidad (descendente)
-                df_acciones = df_acciones.sort_values('Cantidad', ascending=False)
-                
-                # Asignar colores según tipo de acción (estilo LaLiga)
-                colores_acciones = {
-                    'M.J.': '#1E88E5',  # Color para M.J.
-                    'Pases Completados': '#4CAF50',
-                    'Pases Fallados': '#E57373',
-                    'Tiros a Puerta': '#2196F3',
-                    'Tiros Fuera': '#FF9800',
-                    'Recuperaciones': '#9C27B0',
-                    'Faltas': '#F44336',
-                    'Futbolista en Profundidad': '#00BCD4',
-                    'Futbolista de Cara': '#3F51B5',
-                    'Atacar el área': '#FFC107'
-                }
-                
-                colores_barras = [colores_acciones.get(tipo, '#757575') for tipo in df_acciones['Tipo']]
-                
-                # Crear gráfico de barras con estilo profesional
-                fig_acciones = go.Figure()
-                
-                fig_acciones.add_trace(go.Bar(
-                    x=df_acciones['Tipo'],
-                    y=df_acciones['Cantidad'],
-                    marker_color=colores_barras,
-                    text=df_acciones['Cantidad'],
-                    textposition='auto'
-                ))
-                
-                fig_acciones.update_layout(
-                    title={
-                        'text': "Resumen de Acciones",
-                        'y':0.95,
-                        'x':0.5,
-                        'xanchor': 'center',
-                        'yanchor': 'top',
-                        'font': dict(size=18, color='#1a5276')
-                    },
-                    xaxis=dict(
-                        title='',
-                        tickangle=-45,
-                        tickfont=dict(size=12)
-                    ),
-                    yaxis=dict(
-                        title='',
-                        gridcolor='#eee',
-                        zerolinecolor='#eee'
-                    ),
-                    plot_bgcolor='white',
-                    paper_bgcolor='white',
-                    height=450,
-                    margin=dict(l=40, r=40, t=60, b=80)
-                )
-                
-                st.plotly_chart(fig_acciones, use_container_width=True)
-                
-                # Capturar gráfico para PDF
-                try:
-                    charts['resumen_acciones'] = capturar_graficos_plotly(fig_acciones)
-                except Exception as e:
-                    st.warning(f"No se pudo capturar el gráfico de resumen: {str(e)}")
-                
-                st.markdown('</div>', unsafe_allow_html=True)
-
-                # Nueva sección: Visualización de pases en el campo
-                st.markdown('<div class="section-header">Mapa de Pases en el Campo</div>', unsafe_allow_html=True)
-                st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                
-                # Llamar a la función que visualiza los pases en el campo
-                mapa_pases_base64 = visualizar_pases_campo(df_jugador)
-                
-                # Guardar imagen para PDF
-                if mapa_pases_base64:
-                    charts['mapa_pases'] = mapa_pases_base64
-                
-                st.markdown('</div>', unsafe_allow_html=True)
-                
-                # Sección para exportar a PDF
-                st.markdown('<div class="section-header">Exportar Análisis</div>', unsafe_allow_html=True)
-                
-                # Si hay foto del jugador, capturarla
-                if info_jugador:
-                    ruta_foto = obtener_foto_jugador(info_jugador.get("id"))
-                    if ruta_foto and os.path.exists(ruta_foto):
-                        with open(ruta_foto, "rb") as img_file:
-                            charts['foto_jugador'] = base64.b64encode(img_file.read()).decode()
-                
-                # Generar el PDF con HTML/CSS
-                pdf_data = generar_pdf_html(
-                    jugador_seleccionado,
-                    info_jugador,
-                    minutos_jugados,
-                    pases_completados,
-                    precision_pases,
-                    pases_fallados,
-                    finalizaciones_totales,
-                    goles,
-                    encontrar_profundidad,
-                    encontrar_cara,
-                    atacar_area,
-                    faltas,
-                    indice_rendimiento,
-                    charts
-                )
-                
-                # Botón para descargar
-                nombre_archivo = f"{jugador_seleccionado.replace(' ', '_')}_analisis.pdf"
-                st.markdown(crear_boton_descargar_pdf(pdf_data, nombre_archivo), unsafe_allow_html=True)
+            # Jugador, periodo y análisis (fragmento: sus filtros no recargan toda la página)
+            mostrar_analisis_individual(df)
 
         except Exception as e:
             st.error(f"Error al procesar el archivo: {str(e)}")
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Columnas sin las que no se puede analizar un partido
+COLUMNAS_OBLIGATORIAS = ["Team", "code", "Player", "startX", "startY", "Periodo", "Mins"]
+
+# Columnas que se añaden vacías si el archivo no las trae
+COLUMNAS_OPCIONALES = ["group", "Secundary", "endX", "endY", "text", "Jugadores", "M.J"]
+
+# Columnas de la tabla de eventos (el resto de la fila es la lista de convocados: Jugadores, M.J)
+COLUMNAS_EVENTO = [
+    "Team", "code", "group", "Player", "Secundary",
+    "startX", "startY", "endX", "endY", "Periodo", "Mins", "text"
+]
+
+# Columnas que deben ser numéricas
+COLUMNAS_NUMERICAS = ["startX", "startY", "endX", "endY", "Periodo", "Mins"]
+
+# Número máximo de filas descartadas que se muestran al usuario
+MAX_FILAS_INFORME = 200
+
+
+def validar_eventos(df):
+    """
+    Valida la tabla de eventos de un partido y devuelve (df_limpio, informe).
+
+    El informe es un diccionario con:
+    - 'errores': problemas que impiden usar el archivo (p. ej. columnas que faltan).
+      Si hay errores, df_limpio es None.
+    - 'filas_descartadas': lista de {'fila', 'motivo'} con el número de fila del Excel.
+
+    En la tabla limpia todas las columnas existen, las numéricas son números
+    y cada evento tiene equipo, acción, periodo, minuto y coordenadas completas.
+    Las filas de evento incorrectas se vacían (se conserva la lista de convocados
+    que comparte fila) y las filas que quedan vacías se eliminan. Las filas sin
+    evento llevan Periodo y Mins a 0.
+    """
+    informe = {'errores': [], 'filas_descartadas': []}
+
+    faltan = [col for col in COLUMNAS_OBLIGATORIAS if col not in df.columns]
+    if faltan:
+        informe['errores'].append(f"Faltan columnas obligatorias: {', '.join(faltan)}")
+        return None, informe
+
+    df = df.copy()
+    for col in COLUMNAS_OPCIONALES:
+        if col not in df.columns:
+            df[col] = np.nan
+
+    # Convertir las columnas numéricas y detectar los valores que no lo son
+    no_numericos = {}
+    for col in COLUMNAS_NUMERICAS:
+        numeros = pd.to_numeric(df[col], errors="coerce")
+        no_numericos[col] = numeros.isna() & df[col].notna()
+        df[col] = numeros
+    df["M.J"] = pd.to_numeric(df["M.J"], errors="coerce")
+
+    es_evento = df[COLUMNAS_EVENTO].notna().any(axis=1)
+    es_pase = df["code"].astype(object).eq("Pases")
+
+    # Reglas en orden: cada fila se informa con el primer motivo que incumple
+    reglas = [
+        (df["Team"].isna() | df["code"].isna(), "Sin equipo o acción"),
+    ]
+    for col in COLUMNAS_NUMERICAS:
+        reglas.append((no_numericos[col], f"Valor no numérico en {col}"))
+    reglas += [
+        (df["Periodo"].isna() | (df["Periodo"] < 1), "Periodo vacío o no válido"),
+        (df["Mins"].isna() | (df["Mins"] < 0), "Minuto vacío o no válido"),
+        (df["startX"].isna() != df["startY"].isna(), "Coordenadas de inicio incompletas"),
+        (df["endX"].isna() != df["endY"].isna(), "Coordenadas de fin incompletas"),
+        (es_pase & df["startX"].isna(), "Pase sin coordenadas de inicio"),
+        (es_pase & df["Secundary"].notna() & df["endX"].isna(), "Pase completado sin coordenadas de fin"),
+    ]
+
+    condiciones = [(condicion & es_evento).to_numpy() for condicion, _ in reglas]
+    motivos = np.select(condiciones, [motivo for _, motivo in reglas], default="")
+    malas = motivos != ""
+
+    # Fila del Excel: índice + 2 (cabecera y numeración desde 1)
+    informe['filas_descartadas'] = [
+        {'fila': int(indice) + 2, 'motivo': str(motivo)}
+        for indice, motivo in zip(df.index[malas], motivos[malas])
+    ]
+
+    df.loc[malas, COLUMNAS_EVENTO] = np.nan
+    df = df[df.notna().any(axis=1)].reset_index(drop=True)
+
+    # Las filas que solo tienen la lista de convocados llevan periodo y minuto 0,
+    # así Periodo y Mins se mantienen enteros (ningún filtro usa el periodo 0)
+    sin_evento = df["Team"].isna() & df["code"].isna()
+    df.loc[sin_evento, ["Periodo", "Mins"]] = 0
+
+    return df, informe
+
+
+def mostrar_informe(informe, nombre_archivo):
+    """Muestra al usuario el resultado de la validación de un archivo"""
+    for error in informe['errores']:
+        st.error(f"❌ {nombre_archivo}: {error}")
+
+    descartadas = informe['filas_descartadas']
+    if descartadas:
+        st.warning(f"⚠️ {nombre_archivo}: se han descartado {len(descartadas)} filas con datos incorrectos.")
+        with st.expander("Ver filas descartadas"):
+            st.dataframe(pd.DataFrame(descartadas[:MAX_FILAS_INFORME]), use_container_width=True)
+            if len(descartadas) > MAX_FILAS_INFORME:
+                st.write(f"... y {len(descartadas) - MAX_FILAS_INFORME} filas más.")
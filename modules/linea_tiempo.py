@@ -0,0 +1,90 @@
+import pandas as pd
+from modules.red_pases import pases_completados_valencia
+
+
+def _rangos_tiempo(minutos, periodos_pases):
+    """
+    Rango de minutos de cada periodo con pases del Valencia y de la 2ª Parte.
+    El periodo 1 va del primer al último minuto con eventos; los siguientes
+    empiezan justo después del anterior.
+    """
+    rangos_tiempo = {}
+    if 1 in periodos_pases:
+        if 1 in minutos.index:
+            rangos_tiempo[1] = {"inicio": minutos.at[1, "min"], "fin": minutos.at[1, "max"]}
+        else:
+            rangos_tiempo[1] = {"inicio": 0, "fin": 45}
+
+    ultimo_fin = rangos_tiempo.get(1, {"fin": 45})["fin"]
+    for periodo in periodos_pases:
+        if periodo == 1:
+            continue
+        inicio = ultimo_fin + 1
+        if periodo in minutos.index:
+            fin = minutos.at[periodo, "max"]
+        else:
+            fin = inicio + 10  # Rango arbitrario de 10 minutos
+        rangos_tiempo[periodo] = {"inicio": inicio, "fin": fin}
+        ultimo_fin = fin
+
+    if any(p > 1 for p in periodos_pases):
+        rangos_tiempo["2ª Parte"] = {
+            "inicio": rangos_tiempo[min(periodos_pases)]["fin"] + 1,
+            "fin": rangos_tiempo[max(periodos_pases)]["fin"]
+        }
+
+    return rangos_tiempo
+
+
+def calcular_linea_tiempo(df):
+    """
+    Línea de tiempo de un partido. Devuelve un diccionario con:
+    - 'minutos': DataFrame por Periodo con el primer (min) y último (max) minuto con eventos.
+    - 'rangos': {periodo o "2ª Parte": {'inicio', 'fin'}} de los periodos con pases del Valencia.
+    - 'sustituciones': DataFrame (Periodo, Mins, sale, entra) de los cambios del Valencia.
+    - 'sustitutos': jugadores del Valencia que entran tras el primer periodo.
+    - 'apariciones': DataFrame indexado por (Team, Player, Periodo) con el primer
+      ('primera') y último ('ultima') minuto en que aparece cada jugador.
+    - 'suplentes': jugadores cuya primera aparición es posterior al minuto 1.
+    """
+    minutos = df[df["Mins"] > 0].groupby("Periodo")["Mins"].agg(["min", "max"])
+    periodos_pases = sorted(pases_completados_valencia(df)["Periodo"].unique())
+    rangos = _rangos_tiempo(minutos, periodos_pases)
+
+    cambios = df[(df['Team'] == 'Valencia') & (df['code'] == 'Sustitucion') & df['Secundary'].notna()]
+    sustituciones = pd.DataFrame({
+        "Periodo": cambios["Periodo"], "Mins": cambios["Mins"],
+        # El jugador que entra es el 'Secundary'
+        "sale": cambios["Player"], "entra": cambios["Secundary"]
+    }).reset_index(drop=True)
+    fin_primer_periodo = rangos.get(1, {"fin": 45})["fin"]
+    sustitutos = set(sustituciones.loc[sustituciones["Mins"] >= fin_primer_periodo, "entra"].unique())
+
+    apariciones = (df[df["Player"].notna()]
+                   .groupby(["Team", "Player", "Periodo"], observed=True)["Mins"]
+                   .agg(primera="min", ultima="max"))
+    primera_aparicion = apariciones.groupby(level="Player", observed=True)["primera"].min()
+    suplentes = primera_aparicion[primera_aparicion > 1].index.tolist()
+
+    return {
+        "minutos": minutos,
+        "rangos": rangos,
+        "sustituciones": sustituciones,
+        "sustitutos": sustitutos,
+        "apariciones": apariciones,
+        "suplentes": suplentes,
+    }
+
+
+def minutos_estimados(linea_tiempo, jugador, periodo=None, equipo="Valencia"):
+    """
+    Minutos jugados estimados a partir de las apariciones del jugador:
+    suma, en cada periodo, del último menos el primer minuto en que aparece, más uno.
+    """
+    try:
+        del_jugador = linea_tiempo["apariciones"].loc[(equipo, jugador)]
+    except KeyError:
+        return 0
+    if periodo is not None:
+        del_jugador = del_jugador[del_jugador.index == periodo]
+    return int(((del_jugador["ultima"] - del_jugador["primera"]).astype(int) + 1).sum())
@@ -0,0 +1,83 @@
+import re
+import unicodedata
+import pandas as pd
+from modules.linea_tiempo import minutos_estimados
+
+# Origen de los minutos de cada jugador en la tabla de minutos
+ORIGEN_ACTA = "M.J"
+ORIGEN_ESTIMADO = "estimado"
+
+
+def nombre_sin_dorsal(jugador):
+    """Nombre del jugador sin el dorsal si está en formato "#. Nombre\""""
+    partes = str(jugador).split(". ", 1)
+    return partes[1] if len(partes) == 2 else str(jugador)
+
+
+def normalizar_nombre(nombre):
+    """Clave para comparar nombres: sin dorsal, sin tildes, en minúsculas y sin espacios de más"""
+    nombre = re.sub(r"^\s*\d+\.\s*", "", str(nombre))
+    nombre = unicodedata.normalize("NFKD", nombre).encode("ascii", "ignore").decode("ascii")
+    return " ".join(nombre.lower().split())
+
+
+def _convocados(df):
+    """Lista de convocados (Jugadores -> M.J) en el orden del archivo, una entrada por nombre"""
+    convocados = df.loc[df["Jugadores"].notna() & df["M.J"].notna(), ["Jugadores", "M.J"]]
+    convocados = convocados.assign(Jugadores=convocados["Jugadores"].astype(str))
+    return convocados.drop_duplicates("Jugadores")
+
+
+def _buscar_en_convocados(convocados, por_nombre, por_clave, jugador):
+    """
+    Minutos del acta (M.J) del jugador: primero por nombre exacto, después por
+    nombre normalizado y por último por coincidencia parcial del nombre. None si no está.
+    """
+    if jugador in por_nombre:
+        return por_nombre[jugador]
+    clave = normalizar_nombre(jugador)
+    if clave in por_clave:
+        return por_clave[clave]
+    nombre = nombre_sin_dorsal(jugador)
+    for convocado, minutos in zip(convocados["Jugadores"], convocados["M.J"]):
+        if nombre in convocado or convocado in jugador:
+            return minutos
+    return None
+
+
+def calcular_tabla_minutos(df, linea_tiempo):
+    """
+    Minutos jugados de cada jugador del Valencia que aparece en el partido.
+    DataFrame indexado por jugador con 'minutos' y 'origen' ("M.J" si están
+    en la lista de convocados, "estimado" si se calculan por sus apariciones).
+    """
+    convocados = _convocados(df)
+    por_nombre = dict(zip(convocados["Jugadores"], convocados["M.J"]))
+    por_clave = {}
+    for convocado, minutos in zip(convocados["Jugadores"], convocados["M.J"]):
+        por_clave.setdefault(normalizar_nombre(convocado), minutos)
+
+    jugadores = df.loc[(df["Team"] == "Valencia") & df["Player"].notna(), "Player"].unique()
+    filas = []
+    for jugador in jugadores:
+        minutos = _buscar_en_convocados(convocados, por_nombre, por_clave, jugador)
+        if minutos is not None:
+            filas.append((jugador, int(minutos), ORIGEN_ACTA))
+        else:
+            filas.append((jugador, minutos_estimados(linea_tiempo, jugador), ORIGEN_ESTIMADO))
+
+    tabla = pd.DataFrame(filas, columns=["Player", "minutos", "origen"])
+    return tabla.set_index("Player")
+
+
+def minutos_de_jugador(tabla_minutos, linea_tiempo, jugador, periodo=None):
+    """
+    Minutos jugados por el jugador según la tabla del partido. Si no constan
+    en el acta y se indica un periodo, se estiman solo para ese periodo.
+    """
+    if jugador not in tabla_minutos.index:
+        return minutos_estimados(linea_tiempo, jugador, periodo)
+    fila = tabla_minutos.loc[jugador]
+    if fila["origen"] == ORIGEN_ESTIMADO and periodo is not None:
+        return minutos_estimados(linea_tiempo, jugador, periodo)
+    return int(fila["minutos"])
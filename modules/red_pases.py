@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+from matplotlib.lines import Line2D
+from modules.campo import crear_campo
+from modules.dibujo import dibujar_lineas, dibujar_puntos
+
+# Grosor máximo de las conexiones y tamaño máximo de los jugadores en el gráfico
+MAX_LINE_WIDTH = 18
+MAX_MARKER_SIZE = 3000
+
+
+def pases_completados_valencia(df):
+    """Pases del Valencia con pasador y receptor (la validación garantiza sus coordenadas)"""
+    return df[(df['Team'] == 'Valencia') & (df['code'] == 'Pases') &
+              df['Player'].notna() & df['Secundary'].notna()]
+
+
+def calcular_red_pases(df_pases):
+    """
+    Calcula la red de pases de un conjunto de pases completados en una sola pasada.
+
+    Devuelve un diccionario con:
+    - 'nodos': DataFrame (Player, X, Y, count, marker_size) con la posición media
+      de cada jugador (origen de sus pases y destino de los recibidos) y sus
+      intervenciones (pases dados + recibidos), ordenado por jugador.
+    - 'conexiones': DataFrame (Player, Secundary, count, width, x_origen, y_origen,
+      x_destino, y_destino) con los pases entre cada pareja de jugadores.
+    """
+    n_pases = len(df_pases)
+    # Códigos enteros de pasador y receptor sobre la lista común de jugadores
+    codigos, jugadores = pd.factorize(
+        pd.concat([df_pases["Player"], df_pases["Secundary"]], ignore_index=True), sort=True
+    )
+    n_jugadores = len(jugadores)
+    origen, destino = codigos[:n_pases], codigos[n_pases:]
+
+    x = np.concatenate([df_pases["startX_conv"].to_numpy("float64"), df_pases["endX_conv"].to_numpy("float64")])
+    y = np.concatenate([df_pases["startY_conv"].to_numpy("float64"), df_pases["endY_conv"].to_numpy("float64")])
+    intervenciones = np.bincount(codigos, minlength=n_jugadores)
+    con_posicion = ~np.isnan(x) & ~np.isnan(y)
+    muestras = np.bincount(codigos[con_posicion], minlength=n_jugadores)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_media = np.bincount(codigos[con_posicion], weights=x[con_posicion], minlength=n_jugadores) / muestras
+        y_media = np.bincount(codigos[con_posicion], weights=y[con_posicion], minlength=n_jugadores) / muestras
+
+    nodos = pd.DataFrame({
+        "Player": np.asarray(jugadores, dtype=object),
+        "X": x_media, "Y": y_media,
+        "count": intervenciones
+    })
+    maximo = intervenciones.max() if n_jugadores else 0
+    nodos["marker_size"] = intervenciones / maximo * MAX_MARKER_SIZE if maximo > 0 else 100
+
+    # Conexiones: cada pareja (pasador, receptor) es un único entero origen * n + destino
+    parejas, pases = np.unique(origen.astype(np.int64) * n_jugadores + destino, return_counts=True)
+    origen_par, destino_par = parejas // n_jugadores, parejas % n_jugadores
+    conexiones = pd.DataFrame({
+        "Player": nodos["Player"].to_numpy()[origen_par],
+        "Secundary": nodos["Player"].to_numpy()[destino_par],
+        "count": pases,
+        "width": pases / pases.max() * MAX_LINE_WIDTH if len(pases) else pases,
+        "x_origen": x_media[origen_par], "y_origen": y_media[origen_par],
+        "x_destino": x_media[destino_par], "y_destino": y_media[destino_par],
+    })
+
+    return {"nodos": nodos, "conexiones": conexiones}
+
+
+def calcular_redes_partido(df):
+    """Red de pases del Valencia de cada periodo del partido y de la 2ª Parte (periodos > 1)"""
+    df_pases = pases_completados_valencia(df)
+    redes = {}
+    for periodo in sorted(df_pases["Periodo"].unique()):
+        redes[periodo] = calcular_red_pases(df_pases[df_pases["Periodo"] == periodo])
+    segunda_parte = df_pases[df_pases["Periodo"] > 1]
+    if not segunda_parte.empty:
+        redes["2ª Parte"] = calcular_red_pases(segunda_parte)
+    return redes
+
+
+def dibujar_red_pases(red, titulo, sustitutos=(), marcar_sustitutos=False):
+    """
+    Dibuja una red de pases calculada con calcular_red_pases y devuelve la figura.
+    Si marcar_sustitutos es True, los jugadores de sustitutos se dibujan con
+    marcador cuadrado y se señalan con (S) en la lista de la derecha.
+    """
+    nodos, conexiones = red["nodos"], red["conexiones"]
+
+    # Dibujar el campo
+    fig, ax = crear_campo()
+
+    # Dibujar conexiones (líneas de pases)
+    dibujar_lineas(ax, conexiones["x_origen"], conexiones["y_origen"], conexiones["x_destino"], conexiones["y_destino"],
+                   "Orange", anchos=conexiones["width"].to_numpy("float64"), alpha=0.6, zorder=1)
+
+    # Dibujar jugadores - usando marcadores diferentes para sustitutos si se piden
+    es_sustituto = nodos["Player"].isin(sustitutos).to_numpy() & marcar_sustitutos
+    dibujar_puntos(ax, nodos["X"], nodos["Y"], "black", nodos["marker_size"].to_numpy("float64"),
+                   np.where(es_sustituto, "s", "o"), "Orange", zorder=5)
+    # Mostrar la leyenda solo si hay sustitutos marcados
+    mostrar_leyenda = es_sustituto.any()
+
+    for jugador, x, y in nodos[["Player", "X", "Y"]].itertuples(index=False):
+        numero_jugador = jugador.split(". ")[0] if ". " in jugador else jugador  # Ajuste para formato "3. Rubi"
+        ax.text(x, y, numero_jugador, color="white", fontsize=14,
+                ha="center", va="center", zorder=6, fontweight="bold")
+
+    # Lista de jugadores a la derecha
+    for idx, jugador in enumerate(sorted(nodos["Player"])):
+        indicador = " (S)" if marcar_sustitutos and jugador in sustitutos else ""
+        ax.text(125, 70 - (idx * 4), f"{jugador}{indicador}", color="black", fontsize=12, va="center")
+
+    # Agregar leyenda solo si hay sustitutos marcados
+    if mostrar_leyenda:
+        leyenda_elementos = [
+            Line2D([0], [0], marker='o', color='w', markerfacecolor='black', markersize=10, label='Titulares'),
+            Line2D([0], [0], marker='s', color='w', markerfacecolor='black', markersize=10, label='Sustitutos')
+        ]
+        ax.legend(handles=leyenda_elementos, loc='upper right', fontsize=10)
+
+    fig.suptitle(titulo, color="black", fontsize=20)
+    return fig
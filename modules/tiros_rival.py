@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+# Contadores de las finalizaciones del rival
+COLUMNAS_TIROS = ["finalizaciones", "goles", "tiros_puerta", "tiros_fuera"]
+
+# Columnas de cada finalización que se guardan para el detalle
+COLUMNAS_DETALLE = ["Periodo", "Mins", "code", "group", "Player", "text"]
+
+
+def _contar(tiros, claves):
+    """Finalizaciones, goles, tiros a puerta y fuera agrupados por claves"""
+    indicadores = pd.DataFrame({
+        "finalizaciones": 1,
+        "goles": tiros["text"] == "Gol",
+        "tiros_puerta": tiros["group"] == "A puerta",
+        "tiros_fuera": tiros["group"] == "Fuera",
+    }, index=tiros.index).astype("int64")
+    return indicadores.groupby(claves).sum()
+
+
+def calcular_tiros_rival(df, linea_tiempo):
+    """
+    Resumen de las finalizaciones del rival en un partido. Devuelve un diccionario con:
+    - 'rival': nombre del equipo rival (None si no aparece en el archivo).
+    - 'tiros': DataFrame con COLUMNAS_DETALLE de cada finalización del rival.
+    - 'en_campo': DataFrame por jugador del Valencia con su minuto de 'entrada' y de
+      'salida' del campo según los cambios de la línea de tiempo (±inf si no hay cambio).
+    - 'por_periodo': DataFrame por Periodo con COLUMNAS_TIROS.
+    - 'por_jugador': DataFrame indexado por (Player, Periodo) con COLUMNAS_TIROS de los
+      tiros recibidos mientras cada jugador del Valencia estaba en el campo, para las
+      estadísticas de los porteros.
+    """
+    rivales = [equipo for equipo in df["Team"].unique().tolist() if equipo != "Valencia" and isinstance(equipo, str)]
+    tiros = df[df["Team"].notna() & (df["Team"] != "Valencia") & (df["code"] == "Finalizaciones")]
+    por_periodo = _contar(tiros, tiros["Periodo"])
+
+    # Minuto de entrada y de salida de cada jugador (sin cambio: todo el partido)
+    jugadores = df.loc[(df["Team"] == "Valencia") & df["Player"].notna(), "Player"].astype(str).unique()
+    sustituciones = linea_tiempo["sustituciones"]
+    entrada = sustituciones.groupby("entra", observed=True)["Mins"].min().reindex(jugadores).fillna(-np.inf).to_numpy("float64")
+    salida = sustituciones.groupby("sale", observed=True)["Mins"].max().reindex(jugadores).fillna(np.inf).to_numpy("float64")
+
+    # Cada tiro se asigna a los jugadores en el campo en su minuto: jugadores x tiros
+    minutos = tiros["Mins"].to_numpy("float64")
+    en_campo = (entrada[:, None] <= minutos) & (minutos < salida[:, None])
+    fila_jugador, fila_tiro = np.nonzero(en_campo)
+    tiros_en_campo = tiros.iloc[fila_tiro].reset_index(drop=True)
+    por_jugador = _contar(tiros_en_campo, [np.asarray(jugadores, dtype=object)[fila_jugador],
+                                           tiros_en_campo["Periodo"].to_numpy()])
+    por_jugador.index.names = ["Player", "Periodo"]
+
+    return {
+        "rival": rivales[0] if rivales else None,
+        "tiros": tiros[COLUMNAS_DETALLE].reset_index(drop=True),
+        "en_campo": pd.DataFrame({"entrada": entrada, "salida": salida}, index=pd.Index(jugadores, name="Player")),
+        "por_periodo": por_periodo,
+        "por_jugador": por_jugador,
+    }
+
+
+def tiros_recibidos(resumen, jugador=None, periodo=None):
+    """
+    Tiros recibidos en el partido (o en un periodo): los de todo el equipo o, si se
+    indica un jugador, solo los recibidos con él en el campo. Incluye las paradas
+    (tiros a puerta que no acaban en gol).
+    """
+    tabla = resumen["por_periodo"]
+    if jugador is not None:
+        por_jugador = resumen["por_jugador"]
+        tabla = por_jugador.xs(jugador, level="Player") if jugador in por_jugador.index.get_level_values("Player") else tabla.iloc[0:0]
+    if periodo is not None:
+        tabla = tabla[tabla.index == periodo]
+    totales = tabla.sum().reindex(COLUMNAS_TIROS, fill_value=0)
+
+    goles, puerta = int(totales["goles"]), int(totales["tiros_puerta"])
+    return {
+        "finalizaciones_recibidas": int(totales["finalizaciones"]),
+        "goles_recibidos": goles,
+        "tiros_recibidos_puerta": puerta,
+        "tiros_recibidos_fuera": int(totales["tiros_fuera"]),
+        "paradas": max(0, puerta - goles),
+    }
+
+
+def detalle_tiros(resumen, jugador=None, periodo=None):
+    """Finalizaciones del rival (todas o las recibidas con el jugador en el campo), opcionalmente de un periodo"""
+    tiros = resumen["tiros"]
+    if jugador is not None:
+        if jugador not in resumen["en_campo"].index:
+            return tiros.iloc[0:0]
+        entrada, salida = resumen["en_campo"].loc[jugador, ["entrada", "salida"]]
+        tiros = tiros[(tiros["Mins"] >= entrada) & (tiros["Mins"] < salida)]
+    if periodo is not None:
+        tiros = tiros[tiros["Periodo"] == periodo]
+    return tiros
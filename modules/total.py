@@ -14,6 +14,8 @@ from PIL import Image as PILImage
 
 # Importar funciones comunes de individuales.py
 from modules.individuales import encontrar_jugador_plantilla, obtener_foto_jugador
+from modules import indice_jugadores
+from modules.catalogo import sin_duplicados
 
 # Constantes
 PLAYERS_DATA_DIR = "players_data"
@@ -34,6 +36,26 @@ COLOR_FALTAS = "#F44336"               # Rojo
 COLOR_AREA = "#FFEB3B"                 # Amarillo claro
 COLOR_PERDIDAS = "#795548"             # Marrón
 
+# Estadísticas que se acumulan por partido (además de los minutos)
+ESTADISTICAS_TOTALES = [
+    'pases_completados', 'pases_fallados', 'finalizaciones', 'goles',
+    'tiros_puerta', 'tiros_fuera', 'faltas', 'recuperaciones',
+    'profundidad', 'cara', 'area',
+    'paradas', 'goles_recibidos', 'tiros_recibidos_puerta', 'tiros_recibidos_fuera'
+]
+
+# Nombres de las columnas de la clasificación del equipo
+NOMBRES_CLASIFICACION = {
+    'partidos': "Partidos", 'minutos': "Minutos",
+    'pases_completados': "Pases completados", 'pases_fallados': "Pases fallados",
+    'finalizaciones': "Finalizaciones", 'goles': "Goles",
+    'tiros_puerta': "Tiros a puerta", 'tiros_fuera': "Tiros fuera",
+    'faltas': "Faltas", 'recuperaciones': "Recuperaciones",
+    'profundidad': "Encontrar en profundidad", 'cara': "Encontrar de cara", 'area': "Atacar el área",
+    'paradas': "Paradas", 'goles_recibidos': "Goles recibidos",
+    'tiros_recibidos_puerta': "Tiros recibidos a puerta", 'tiros_recibidos_fuera': "Tiros recibidos fuera"
+}
+
 # Función para obtener archivos disponibles según el usuario
 def obtener_archivos_disponibles():
     archivos_a_mostrar = []
@@ -50,56 +72,38 @@ def obtener_archivos_disponibles():
         equipo_actual = st.session_state.get("equipo_actual", "")
         archivos_a_mostrar = [a for a in st.session_state.archivos_subidos if a['equipo'] == equipo_actual]
     
-    return archivos_a_mostrar
+    # Un mismo partido subido dos veces solo cuenta una vez
+    return sin_duplicados(archivos_a_mostrar)
 
-# Función para obtener jugadores y partidos
+# Función para obtener jugadores y partidos (del índice jugador -> partidos, sin abrir los archivos)
 def obtener_jugadores_y_partidos(archivos_a_mostrar):
     jugadores_por_archivo = {}
     all_players = set()
     fechas_partidos = {}
     
+    # Indexar los partidos que aún no lo estén (p. ej. subidos antes de existir el índice)
     with st.spinner("Cargando datos de partidos..."):
-        for archivo_info in archivos_a_mostrar:
-            ruta_archivo = archivo_info['ruta']
-            nombre_archivo = archivo_info['nombre_original']
-            
-            try:
-                # Extraer fecha del nombre del archivo (asumiendo formato: YYYY-MM-DD_Rival)
-                fecha_str = nombre_archivo.split('_')[0] if '_' in nombre_archivo else None
-                rival_str = nombre_archivo.split('_')[1].replace('.xlsx', '') if '_' in nombre_archivo and len(nombre_archivo.split('_')) > 1 else nombre_archivo
-                
-                try:
-                    fecha_partido = datetime.strptime(fecha_str, "%Y-%m-%d").date() if fecha_str else None
-                except:
-                    fecha_partido = None
-                
-                # Cargar Excel
-                df = pd.read_excel(ruta_archivo)
-                
-                # Filtrar jugadores de Valencia
-                df_valencia = df[df["Team"] == "Valencia"]
-                
-                # Obtener jugadores únicos
-                jugadores = []
-                for jugador in df_valencia["Player"].unique():
-                    if jugador != "Valencia" and isinstance(jugador, str) and pd.notna(jugador):
-                        jugadores.append(jugador)
-                        all_players.add(jugador)
-                
-                # Guardar jugadores de este archivo
-                jugadores_por_archivo[nombre_archivo] = {
-                    'jugadores': jugadores,
-                    'ruta': ruta_archivo,
-                    'fecha': fecha_partido,
-                    'rival': rival_str
-                }
-                
-                # Guardar fecha del partido (para ordenar)
-                if fecha_partido:
-                    fechas_partidos[nombre_archivo] = fecha_partido
-                
-            except Exception as e:
-                st.error(f"Error al procesar {nombre_archivo}: {str(e)}")
+        for archivo_info in indice_jugadores.sincronizar(archivos_a_mostrar):
+            st.error(f"Error al procesar {archivo_info['nombre_original']}")
+    
+    archivos_por_id = {archivo_info['id']: archivo_info for archivo_info in archivos_a_mostrar}
+    for archivo_info in archivos_a_mostrar:
+        fecha_partido, rival_str = indice_jugadores.fecha_y_rival(archivo_info['nombre_original'])
+        jugadores_por_archivo[archivo_info['nombre_original']] = {
+            'id': archivo_info['id'],
+            'jugadores': [],
+            'ruta': archivo_info['ruta'],
+            'fecha': fecha_partido,
+            'rival': rival_str
+        }
+        # Guardar fecha del partido (para ordenar)
+        if fecha_partido:
+            fechas_partidos[archivo_info['nombre_original']] = fecha_partido
+    
+    for fila in indice_jugadores.filas_de_partidos(list(archivos_por_id)):
+        nombre_archivo = archivos_por_id[fila['partido_id']]['nombre_original']
+        jugadores_por_archivo[nombre_archivo]['jugadores'].append(fila['jugador'])
+        all_players.add(fila['jugador'])
     
     # Convertir set a lista y ordenar
     jugadores_unicos = sorted(list(all_players))
@@ -235,23 +239,13 @@ def procesar_datos_partidos(selected_matches, jugador_seleccionado, jugadores_po
     progress_bar = st.progress(0)
     
     # Acumuladores para estadísticas totales
-    total_stats = {
-        'minutos': 0,
-        'pases_completados': 0,
-        'pases_fallados': 0,
-        'finalizaciones': 0,
-        'goles': 0,
-        'tiros_puerta': 0,
-        'tiros_fuera': 0,
-        'faltas': 0,
-        'recuperaciones': 0,
-        'profundidad': 0,
-        'cara': 0,
-        'area': 0,
-        'paradas': 0,
-        'goles_recibidos': 0,
-        'tiros_recibidos_puerta': 0,
-        'tiros_recibidos_fuera': 0
+    total_stats = dict.fromkeys(['minutos'] + ESTADISTICAS_TOTALES, 0)
+    
+    # Filas del jugador en los partidos seleccionados (índice jugador -> partidos)
+    filas_jugador = {
+        fila['partido_id']: fila
+        for fila in indice_jugadores.filas_de_partidos(
+            [jugadores_por_archivo[nombre]['id'] for nombre in selected_matches], jugador_seleccionado)
     }
     
     # Procesar cada partido
@@ -260,41 +254,14 @@ def procesar_datos_partidos(selected_matches, jugador_seleccionado, jugadores_po
         ruta_archivo = info_archivo['ruta']
         
         try:
-            # Cargar Excel
-            df = pd.read_excel(ruta_archivo)
-            
-            # Filtrar datos
-            df_valencia = df[df["Team"] == "Valencia"]
-            df_jugador = df_valencia[df_valencia["Player"] == jugador_seleccionado]
-            
-            if len(df_jugador) == 0:
+            fila = filas_jugador.get(info_archivo['id'])
+            if fila is None or fila['estadisticas']["total_acciones"] == 0:
                 # Si no hay datos para este jugador en este partido, saltar
                 continue
+            estadisticas = fila['estadisticas']
             
-            # Obtener minutos jugados
-            minutos_jugados = None
-            # Buscar en las filas donde Jugadores y M.J contienen la información
-            jugador_mj_info = df[(df["Jugadores"] == jugador_seleccionado) & pd.notna(df["M.J"])]
-            if not jugador_mj_info.empty:
-                # Usar el valor de M.J cuando el jugador aparece en la columna Jugadores
-                minutos_jugados = int(jugador_mj_info["M.J"].iloc[0])
-            else:
-                # Intentar buscar con otro formato o nombre parcial
-                for idx, row in df.iterrows():
-                    if pd.notna(row.get("Jugadores")) and pd.notna(row.get("M.J")):
-                        if jugador_nombre in str(row["Jugadores"]) or str(row["Jugadores"]) in jugador_seleccionado:
-                            minutos_jugados = int(row["M.J"])
-                            break
-                            
-            # Si no pudimos obtener M.J, calculamos una estimación
-            if minutos_jugados is None:
-                # Calcular minutos jugados basados en Mins
-                periodos_jugados = df_jugador["Periodo"].unique()
-                minutos_jugados = 0
-                for periodo in periodos_jugados:
-                    mins_periodo = df_jugador[df_jugador["Periodo"] == periodo]["Mins"]
-                    if not mins_periodo.empty:
-                        minutos_jugados += (max(mins_periodo) - min(mins_periodo) + 1)
+            # Minutos jugados: M.J del acta o estimación (calculados al indexar el partido)
+            minutos_jugados = fila['minutos']
             
             datos_partido = {
                 'nombre': nombre_archivo,
@@ -307,21 +274,15 @@ def procesar_datos_partidos(selected_matches, jugador_seleccionado, jugadores_po
             # Sumar al total
             total_stats['minutos'] += minutos_jugados
             
-            # Estadísticas del portero
-            df_rival = df[df["Team"] != "Valencia"]
-            
-            # Finalizaciones del equipo rival (para porteros)
-            df_rival_finalizaciones = df_rival[df_rival["code"] == "Finalizaciones"]
-            goles_recibidos = df_rival_finalizaciones[df_rival_finalizaciones["text"] == "Gol"].shape[0]
-            tiros_puerta = df_rival_finalizaciones[df_rival_finalizaciones["group"] == "A puerta"].shape[0]
-            tiros_fuera = df_rival_finalizaciones[df_rival_finalizaciones["group"] == "Fuera"].shape[0]
-            paradas = max(0, tiros_puerta - goles_recibidos)
+            # Estadísticas del portero: finalizaciones del rival con el jugador en el campo
+            goles_recibidos = estadisticas["goles_recibidos"]
+            tiros_puerta = estadisticas["tiros_recibidos_puerta"]
+            tiros_fuera = estadisticas["tiros_recibidos_fuera"]
+            paradas = estadisticas["paradas"]
             
             # Estadísticas de pases
-            df_pases = df_jugador[df_jugador["code"] == "Pases"]
-            pases_totales = len(df_pases)
-            pases_completados = df_pases["Secundary"].notna().sum()
-            pases_fallados = pases_totales - pases_completados
+            pases_completados = estadisticas["pases_completados"]
+            pases_fallados = estadisticas["pases_fallados"]
             
             # Añadir estadísticas comunes
             datos_partido.update({
@@ -335,20 +296,19 @@ def procesar_datos_partidos(selected_matches, jugador_seleccionado, jugadores_po
             
             # Para estadísticas de jugadores de campo
             # Finalizaciones
-            df_finalizaciones = df_jugador[df_jugador["code"] == "Finalizaciones"]
-            finalizaciones_totales = len(df_finalizaciones)
+            finalizaciones_totales = estadisticas["finalizaciones"]
             
             # Goles, tiros a puerta y fuera
-            goles = df_finalizaciones[df_finalizaciones["text"] == "Gol"].shape[0]
-            tiros_puerta_jugador = df_finalizaciones[df_finalizaciones["group"] == "A puerta"].shape[0]
-            tiros_fuera_jugador = df_finalizaciones[df_finalizaciones["group"] == "Fuera"].shape[0]
+            goles = estadisticas["goles"]
+            tiros_puerta_jugador = estadisticas["tiros_puerta"]
+            tiros_fuera_jugador = estadisticas["tiros_fuera"]
             
             # Otras estadísticas
-            faltas = df_jugador[df_jugador["code"] == "Faltas"].shape[0]
-            recuperaciones = df_jugador[df_jugador["code"] == "Recuperaciones"].shape[0]
-            encontrar_profundidad = df_jugador[df_jugador["code"] == "Encontrar Futbolista en profundidad"].shape[0]
-            encontrar_cara = df_jugador[df_jugador["code"] == "Encontrar Futbolista de cara"].shape[0]
-            atacar_area = df_jugador[df_jugador["code"] == "Atacar el área"].shape[0]
+            faltas = estadisticas["faltas"]
+            recuperaciones = estadisticas["recuperaciones"]
+            encontrar_profundidad = estadisticas["profundidad"]
+            encontrar_cara = estadisticas["cara"]
+            atacar_area = estadisticas["area"]
             
             # Añadir todas las estadísticas al diccionario del partido
             datos_partido.update({
@@ -398,6 +358,93 @@ def procesar_datos_partidos(selected_matches, jugador_seleccionado, jugadores_po
     
     return datos_partidos, total_stats
 
+# Función para calcular la clasificación de todos los jugadores en los partidos seleccionados
+def calcular_clasificacion(ids_partidos):
+    """
+    Totales y tasas por 90 minutos de cada jugador en los partidos indicados,
+    con los mismos contadores que procesar_datos_partidos, en una sola pasada
+    sobre el índice jugador -> partidos. DataFrame indexado por jugador.
+    """
+    filas = indice_jugadores.filas_de_partidos(ids_partidos)
+    if not filas:
+        return pd.DataFrame()
+    
+    por_partido = pd.DataFrame([fila['estadisticas'] for fila in filas])
+    por_partido['jugador'] = [fila['jugador'] for fila in filas]
+    por_partido['minutos'] = [fila['minutos'] for fila in filas]
+    # Igual que en procesar_datos_partidos: solo partidos con acciones del jugador
+    por_partido = por_partido[por_partido['total_acciones'] > 0]
+    por_partido['partidos'] = 1
+    
+    totales = por_partido.groupby('jugador')[['partidos', 'minutos'] + ESTADISTICAS_TOTALES].sum()
+    
+    # Tasas por 90 minutos (sin minutos registrados no hay tasa)
+    minutos = totales['minutos'].where(totales['minutos'] > 0)
+    por_90 = totales[ESTADISTICAS_TOTALES].div(minutos, axis=0).mul(90).round(2)
+    return totales.join(por_90.add_suffix('_90'))
+
+# Función para mostrar la clasificación del equipo
+def mostrar_clasificacion_equipo(jugadores_por_archivo, fechas_partidos):
+    partidos_disponibles = sorted(jugadores_por_archivo,
+                                  key=lambda x: fechas_partidos.get(x, datetime.min.date()),
+                                  reverse=True)  # Más recientes primero
+    
+    with st.expander("Seleccionar partidos específicos"):
+        selected_matches = st.multiselect(
+            "Partidos",
+            options=partidos_disponibles,
+            default=partidos_disponibles,
+            format_func=lambda x: f"{jugadores_por_archivo[x]['fecha'].strftime('%d/%m/%Y') if jugadores_por_archivo[x]['fecha'] else 'Sin fecha'} - {jugadores_por_archivo[x]['rival']}",
+            key="partidos_clasificacion"
+        )
+    
+    if not selected_matches:
+        st.warning("No hay partidos seleccionados.")
+        return
+    
+    clasificacion = calcular_clasificacion([jugadores_por_archivo[nombre]['id'] for nombre in selected_matches])
+    if clasificacion.empty:
+        st.warning("No se encontraron datos de jugadores en los partidos seleccionados.")
+        return
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        tasa = st.radio("Valores", ["Totales", "Por 90 minutos"], horizontal=True)
+    columnas = ['partidos', 'minutos'] + (
+        ESTADISTICAS_TOTALES if tasa == "Totales" else [f"{clave}_90" for clave in ESTADISTICAS_TOTALES]
+    )
+    with col2:
+        ordenar_por = st.selectbox(
+            "Ordenar por", columnas[1:],
+            format_func=lambda clave: NOMBRES_CLASIFICACION[clave.removesuffix('_90')]
+        )
+    
+    tabla = clasificacion[columnas].sort_values(ordenar_por, ascending=False)
+    tabla = tabla.rename(columns=lambda clave: NOMBRES_CLASIFICACION[clave.removesuffix('_90')])
+    tabla.index.name = "Jugador"
+    st.dataframe(tabla, use_container_width=True)
+    st.caption(f"Datos acumulados de {len(selected_matches)} partidos. Haz clic en una columna para ordenar la tabla.")
+    
+    # Exportar la clasificación completa (totales y tasas por 90 minutos)
+    exportar = clasificacion.reset_index()
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            label="Descargar CSV",
+            data=exportar.to_csv(index=False).encode("utf-8"),
+            file_name="clasificacion_jugadores.csv",
+            mime="text/csv"
+        )
+    with col2:
+        buffer = io.BytesIO()
+        exportar.to_parquet(buffer, index=False)
+        st.download_button(
+            label="Descargar Parquet",
+            data=buffer.getvalue(),
+            file_name="clasificacion_jugadores.parquet",
+            mime="application/octet-stream"
+        )
+
 # Función para mostrar métricas clave como en individuales.py
 def mostrar_metricas_clave(total_stats, es_portero, num_partidos):
     st.markdown("""
@@ -728,6 +775,12 @@ def pagina_datos_totales():
     # 2. Obtener jugadores y partidos
     jugadores_unicos, jugadores_por_archivo, fechas_partidos = obtener_jugadores_y_partidos(archivos_a_mostrar)
     
+    # Modo: un jugador o clasificación de todo el equipo
+    modo = st.radio("Modo", ["Jugador", "Clasificación del equipo"], horizontal=True)
+    if modo == "Clasificación del equipo":
+        mostrar_clasificacion_equipo(jugadores_por_archivo, fechas_partidos)
+        return
+    
     # 3. Interfaz de selección - MODIFICADO para eliminar selector de número de partidos
     # Seleccionar jugador para analizar
     jugador_seleccionado = st.selectbox("Selecciona un jugador", jugadores_unicos)
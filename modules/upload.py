@@ -2,6 +2,11 @@ import streamlit as st
 import pandas as pd
 import os
 import json
+from modules.cargador import cargar_partido, importar_partido, eliminar_derivados
+from modules.ingesta import mostrar_informe
+from modules.artefactos import eliminar_artefactos
+from modules.cache_graficos import eliminar_graficos
+from modules.importacion import copiar_con_hash
 
 # Directorio para guardar archivos de equipos
 EQUIPOS_DATA_DIR = "data_equipos"
@@ -24,9 +29,15 @@ def guardar_archivo_equipo(equipo_id, uploaded_file, timestamp):
     saved_filename = f"{timestamp}_{uploaded_file.name}"
     file_path = os.path.join(equipo_dir, saved_filename)
     
-    # Guardar archivo original
-    with open(file_path, "wb") as f:
-        f.write(uploaded_file.getbuffer())
+    # Guardar archivo original copiándolo por bloques (con límite de tamaño)
+    uploaded_file.seek(0)
+    copiar_con_hash(uploaded_file, file_path)
+    
+    # Validar el archivo y escribir su sidecar Parquet con la tabla limpia
+    try:
+        mostrar_informe(importar_partido(file_path), uploaded_file.name)
+    except Exception as e:
+        print(f"No se pudo validar el archivo {file_path}: {e}")
     
     # Registrar metadatos del archivo
     archivo_info = {
@@ -79,6 +90,9 @@ def eliminar_archivo_equipo(equipo_id, indice_archivo):
     try:
         if os.path.exists(ruta_archivo):
             os.remove(ruta_archivo)
+            eliminar_derivados(ruta_archivo)
+            eliminar_artefactos(ruta_archivo)
+            eliminar_graficos(ruta_archivo)
         
         # Eliminar el registro de metadatos
         metadatos.pop(indice_archivo)
@@ -125,7 +139,7 @@ def subir_archivo():
             archivo_info = guardar_archivo_equipo(equipo_id, uploaded_file, timestamp)
             
             # Leer y mostrar vista previa
-            df = pd.read_excel(uploaded_file)
+            df = cargar_partido(archivo_info['ruta_archivo'])
             
             st.success(f"✅ Archivo '{uploaded_file.name}' guardado para {nombre_equipo}")
             
@@ -166,7 +180,7 @@ def subir_archivo():
         
         # Leer y mostrar vista previa del archivo
         try:
-            df = pd.read_excel(archivo_actual['ruta_archivo'])
+            df = cargar_partido(archivo_actual['ruta_archivo'])
             
             st.write("Vista previa:")
             st.dataframe(df.head())
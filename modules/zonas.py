@@ -0,0 +1,95 @@
+import os
+import numpy as np
+import pandas as pd
+from modules.coordenadas import ANCHO_CAMPO, ALTO_CAMPO
+
+# Rejilla del campo (columnas a lo largo, filas a lo ancho), configurable por entorno
+COLUMNAS_REJILLA = int(os.environ.get("VCF_COLUMNAS_REJILLA", "12"))
+FILAS_REJILLA = int(os.environ.get("VCF_FILAS_REJILLA", "8"))
+
+# Zonas del campo. El campo propio del Valencia es el de x > 60, así que los
+# tercios van del defensivo (x > 80) al ofensivo (x < 40)
+MITADES = ["Campo Propio", "Campo Contrario"]
+TERCIOS = ["Tercio defensivo", "Tercio medio", "Tercio ofensivo"]
+CARRILES = ["Carril inferior", "Carril central", "Carril superior"]
+
+# Columnas que se añaden al cargar un partido (a partir del inicio de cada evento)
+COLUMNAS_ZONA = ["mitad", "tercio", "carril", "celda"]
+
+# Dimensiones de los conteos por zona de un partido
+DIMENSIONES_ZONAS = ["Team", "Player", "code", "Periodo"] + COLUMNAS_ZONA
+
+
+def _categorias(codigos, etiquetas):
+    """Categórico con las etiquetas de los códigos (-1 = sin coordenadas)"""
+    return pd.Categorical.from_codes(codigos, categories=etiquetas)
+
+
+def _franja(valor, longitud, partes):
+    """Índice de la franja (0..partes-1) de cada valor al dividir longitud en partes iguales; -1 si es NaN"""
+    indice = np.floor(valor / (longitud / partes))
+    indice = np.clip(indice, 0, partes - 1)
+    return np.where(np.isnan(valor), -1, indice).astype("int16")
+
+
+def anadir_zonas(df):
+    """
+    Añade a df la zona del campo donde empieza cada evento (startX_conv, startY_conv),
+    calculada para todas las filas a la vez:
+    - 'mitad': Campo Propio (x > 60) o Campo Contrario.
+    - 'tercio': tercio defensivo, medio u ofensivo.
+    - 'carril': carril inferior, central o superior (según y).
+    - 'celda': celda de la rejilla COLUMNAS_REJILLA x FILAS_REJILLA (fila * columnas + columna; -1 sin coordenadas).
+    """
+    x = df["startX_conv"].to_numpy("float64")
+    y = df["startY_conv"].to_numpy("float64")
+    sin_coordenadas = np.isnan(x)
+
+    df["mitad"] = _categorias(np.where(x > ANCHO_CAMPO / 2, 0, 1).astype("int8"), MITADES)
+    tercio = 2 - _franja(x, ANCHO_CAMPO, 3)
+    df["tercio"] = _categorias(np.where(sin_coordenadas, -1, tercio), TERCIOS)
+    df["carril"] = _categorias(_franja(y, ALTO_CAMPO, 3), CARRILES)
+
+    columna = _franja(x, ANCHO_CAMPO, COLUMNAS_REJILLA)
+    fila = _franja(y, ALTO_CAMPO, FILAS_REJILLA)
+    df["celda"] = np.where((columna < 0) | (fila < 0), -1, fila * COLUMNAS_REJILLA + columna).astype("int16")
+    return df
+
+
+def calcular_conteos_zonas(df):
+    """
+    Número de eventos del partido por equipo, jugador, code, periodo y zona
+    (mitad, tercio, carril y celda de la rejilla), en una sola agrupación.
+    Devuelve un DataFrame con una fila por combinación existente y su número en 'n'.
+    """
+    eventos = df[df["code"].notna()]
+    return (eventos.groupby(DIMENSIONES_ZONAS, observed=True, dropna=False)
+            .size().reset_index(name="n"))
+
+
+def filtrar_conteos_zonas(conteos, equipo=None, jugador=None, code=None, periodos=None):
+    """Filas de los conteos por zona de un equipo, jugador, code y/o lista de periodos"""
+    filtro = pd.Series(True, index=conteos.index)
+    if equipo is not None:
+        filtro &= conteos["Team"] == equipo
+    if jugador is not None:
+        filtro &= conteos["Player"] == jugador
+    if code is not None:
+        filtro &= conteos["code"] == code
+    if periodos is not None:
+        filtro &= conteos["Periodo"].isin(periodos)
+    return conteos[filtro]
+
+
+def contar_por_zona(conteos, zona):
+    """Eventos por zona ('mitad', 'tercio' o 'carril') de unos conteos ya filtrados, de mayor a menor"""
+    por_zona = conteos.groupby(conteos[zona].astype(str))["n"].sum()
+    return por_zona[por_zona > 0].sort_values(ascending=False, kind="stable")
+
+
+def matriz_rejilla(conteos):
+    """Eventos de unos conteos ya filtrados en la rejilla: array FILAS_REJILLA x COLUMNAS_REJILLA (para mapas de calor)"""
+    con_celda = conteos[conteos["celda"] >= 0]
+    matriz = np.bincount(con_celda["celda"].to_numpy("int64"), weights=con_celda["n"].to_numpy("float64"),
+                         minlength=FILAS_REJILLA * COLUMNAS_REJILLA)
+    return matriz.reshape(FILAS_REJILLA, COLUMNAS_REJILLA)
@@ -1,17 +1,22 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
 import os
-import uuid
-import glob
-from datetime import datetime
+import zipfile
 import modules.graficos as graficos
+import modules.catalogo as catalogo
+import modules.agregados as agregados
+import modules.indice_jugadores as indice_jugadores
 from modules.auth import login
 from modules.plantilla import plantilla_page
 from modules.equipos import mostrar_navegador_equipos, mostrar_panel_equipo
 from modules.individuales import pagina_registros_individuales
 from modules.total import pagina_datos_totales
 from modules.pdf_export import download_session_charts
+from modules.cargador import cargar_partido, eliminar_derivados
+from modules.importacion import recorrer_archivos_subidos, nombre_sin_colision, copiar_con_hash, importar_lote
+from modules.artefactos import programar_precalculo, eliminar_artefactos
+from modules.cache_graficos import eliminar_graficos
+from modules.ingesta import mostrar_informe
 
 # Configuración de la página
 st.set_page_config(
@@ -25,82 +30,133 @@ st.set_page_config(
 UPLOAD_DIR = "uploaded_files"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# Equipos de la academia
+EQUIPOS = ["Valencia Mestalla", "Juvenil A", "Juvenil B", "Cadete A", "Cadete B", "Infantil A", "Infantil B"]
+
 # Directorios para equipos (uno por equipo)
 def crear_directorios_equipos():
     """Crea directorios para cada equipo si no existen"""
-    equipos = ["Valencia Mestalla", "Juvenil A", "Juvenil B", "Cadete A", "Cadete B", "Infantil A", "Infantil B"]
-    for equipo in equipos:
+    for equipo in EQUIPOS:
         equipo_dir = os.path.join(UPLOAD_DIR, equipo.lower().replace(" ", "_"))
         os.makedirs(equipo_dir, exist_ok=True)
 
 # Crear directorios al iniciar
 crear_directorios_equipos()
 
-# Función para escanear archivos en el directorio
+# Preparar el catálogo de partidos (solo recorre el disco la primera vez en el proceso)
+catalogo.inicializar(EQUIPOS)
+
+# Función para obtener la lista de archivos
 def escanear_archivos():
-    """Escanea los directorios de equipos y reconstruye la lista de archivos"""
-    archivos = []
-    
-    # Obtener todos los archivos Excel del directorio principal
-    archivos_admin = glob.glob(os.path.join(UPLOAD_DIR, "*.xlsx")) + glob.glob(os.path.join(UPLOAD_DIR, "*.xls"))
-    for archivo in archivos_admin:
-        nombre = os.path.basename(archivo)
-        archivos.append({
-            'id': str(uuid.uuid4()),
-            'nombre_original': nombre,
-            'ruta': archivo,
-            'fecha_subida': datetime.fromtimestamp(os.path.getmtime(archivo)).strftime("%Y-%m-%d %H:%M:%S"),
-            'equipo': 'admin'
-        })
-    
-    # Obtener archivos por equipo
-    equipos = ["Valencia Mestalla", "Juvenil A", "Juvenil B", "Cadete A", "Cadete B", "Infantil A", "Infantil B"]
-    for equipo in equipos:
-        equipo_slug = equipo.lower().replace(" ", "_")
-        equipo_dir = os.path.join(UPLOAD_DIR, equipo_slug)
-        if os.path.exists(equipo_dir):
-            archivos_equipo = glob.glob(os.path.join(equipo_dir, "*.xlsx")) + glob.glob(os.path.join(equipo_dir, "*.xls"))
-            for archivo in archivos_equipo:
-                nombre = os.path.basename(archivo)
-                archivos.append({
-                    'id': str(uuid.uuid4()),
-                    'nombre_original': nombre,
-                    'ruta': archivo,
-                    'fecha_subida': datetime.fromtimestamp(os.path.getmtime(archivo)).strftime("%Y-%m-%d %H:%M:%S"),
-                    'equipo': equipo
-                })
-    
-    return archivos
+    """Devuelve la lista de archivos registrados en el catálogo"""
+    return catalogo.listar_archivos()
 
-# Función para guardar archivos subidos
-def guardar_archivo(uploaded_file, equipo=None):
-    # Conservar el nombre original del archivo
-    filename = uploaded_file.name
-    
+# Directorio donde se guardan los archivos de un equipo
+def directorio_equipo(equipo_asociado):
+    if equipo_asociado == "admin":
+        return UPLOAD_DIR
+    equipo_dir = os.path.join(UPLOAD_DIR, equipo_asociado.lower().replace(" ", "_"))
+    os.makedirs(equipo_dir, exist_ok=True)
+    return equipo_dir
+
+# Función para guardar archivos subidos (uno o varios, sueltos o en .zip)
+def guardar_archivos(uploaded_files, equipo=None):
+    """
+    Guarda los archivos subidos, los valida y convierte en paralelo y
+    registra en el catálogo todos los válidos de una vez al final del lote.
+    """
     # Determinar el equipo asociado
     equipo_asociado = equipo if equipo else st.session_state.get("equipo_actual", "admin")
+    destino = directorio_equipo(equipo_asociado)
+    
+    # Copiar a disco por bloques los archivos nuevos, calculando su hash al vuelo
+    pendientes = {}
+    hash_por_ruta = {}
+    hashes_lote = {}
+    nombres_lote = set()
+    encontrados = 0
+    for uploaded_file in uploaded_files:
+        try:
+            for nombre_subido, flujo in recorrer_archivos_subidos([uploaded_file]):
+                encontrados += 1
+                # Archivos de distintas carpetas de un .zip pueden llamarse igual
+                filename = nombre_sin_colision(nombre_subido, nombres_lote)
+                if filename != os.path.basename(nombre_subido):
+                    st.warning(f"⚠️ Ya hay otro {os.path.basename(nombre_subido)} en esta subida: "
+                               f"{nombre_subido} se guarda como {filename}.")
+                file_path = os.path.join(destino, filename)
+                if os.path.exists(file_path):
+                    st.error(f"❌ Ya existe un archivo {filename}; {nombre_subido} no se ha guardado.")
+                    continue
+                
+                temporal = f"{file_path}.parcial"
+                try:
+                    hash_contenido = copiar_con_hash(flujo, temporal)
+                except ValueError as e:
+                    st.error(f"❌ El archivo {filename} {str(e)} y no se ha guardado.")
+                    continue
+                
+                # El mismo partido puede llegar con otro nombre o a otro equipo
+                duplicado = catalogo.buscar_por_hash(hash_contenido) or hashes_lote.get(hash_contenido)
+                if duplicado:
+                    os.remove(temporal)
+                    st.warning(f"⚠️ {filename} tiene el mismo contenido que {duplicado['nombre_original']} "
+                               f"({duplicado['equipo']}) y no se ha guardado de nuevo.")
+                    continue
+                
+                os.replace(temporal, file_path)
+                pendientes[file_path] = filename
+                hash_por_ruta[file_path] = hash_contenido
+                hashes_lote[hash_contenido] = {'nombre_original': filename, 'equipo': equipo_asociado}
+        except zipfile.BadZipFile as e:
+            st.error(f"❌ No se pudo abrir el archivo {uploaded_file.name}: {str(e)}")
+    
+    if not encontrados:
+        st.warning("⚠️ No se ha encontrado ningún archivo Excel para guardar.")
+        return
     
-    # Determinar la ruta donde se guardará el archivo
-    if equipo_asociado == "admin":
-        file_path = os.path.join(UPLOAD_DIR, filename)
-    else:
-        equipo_slug = equipo_asociado.lower().replace(" ", "_")
-        equipo_dir = os.path.join(UPLOAD_DIR, equipo_slug)
-        os.makedirs(equipo_dir, exist_ok=True)
-        file_path = os.path.join(equipo_dir, filename)
+    if not pendientes:
+        return
     
-    # Comprobar si el archivo ya existe
-    if os.path.exists(file_path):
-        return file_path, f"El archivo {filename} ya existe."
+    # Validar y convertir los archivos en paralelo, mostrando el progreso
+    barra = st.progress(0.0, text=f"Procesando {len(pendientes)} archivos...")
     
-    # Guardar el archivo
-    with open(file_path, "wb") as f:
-        f.write(uploaded_file.getbuffer())
+    def al_terminar_archivo(ruta, informe, completados, total):
+        estado = "❌" if informe['errores'] else "✅"
+        barra.progress(completados / total, text=f"{estado} {pendientes[ruta]} ({completados}/{total})")
     
-    # Reconstruir la lista de archivos
-    st.session_state.archivos_subidos = escanear_archivos()
+    resultados = importar_lote(list(pendientes), al_terminar_archivo)
     
-    return file_path, f"✅ Archivo {filename} guardado correctamente."
+    # Los archivos que no superan la validación no se guardan
+    registros = []
+    for file_path, filename in pendientes.items():
+        informe = resultados[file_path]
+        if informe['errores']:
+            os.remove(file_path)
+            eliminar_derivados(file_path)
+            st.error(f"❌ El archivo {filename} no es válido y no se ha guardado.")
+        else:
+            registros.append({
+                'ruta': file_path,
+                'equipo': equipo_asociado,
+                'nombre_original': filename,
+                'hash': hash_por_ruta[file_path]
+            })
+        mostrar_informe(informe, filename)
+    
+    # Registrar el lote en el catálogo y actualizar la lista una sola vez
+    if registros:
+        registrados = catalogo.registrar_archivos(registros)
+        # Sumar los partidos nuevos a los totales de temporada del equipo
+        for archivo in agregados.anadir_partidos(registrados):
+            st.warning(f"⚠️ No se pudieron actualizar los totales con {archivo['nombre_original']}.")
+        # Añadirlos al índice jugador -> partidos de la página de Datos Totales
+        for archivo in indice_jugadores.indexar_partidos(registrados):
+            st.warning(f"⚠️ No se pudo indexar {archivo['nombre_original']} para Datos Totales.")
+        # Precalcular en segundo plano los artefactos de los partidos nuevos
+        programar_precalculo([registro['ruta'] for registro in registros])
+        st.success(f"✅ {len(registros)} de {len(pendientes)} archivos guardados correctamente.")
+    st.session_state.archivos_subidos = escanear_archivos()
 
 # Función para la página de inicio
 def mostrar_inicio():
@@ -154,17 +210,19 @@ def pagina_subir_archivo():
     # Si es admin, mostrar selector de equipo
     equipo_seleccionado = None
     if st.session_state.get("usuario", "") == "admin":
-        equipos = ["Valencia Mestalla", "Juvenil A", "Juvenil B", "Cadete A", "Cadete B", "Infantil A", "Infantil B"]
-        equipo_seleccionado = st.selectbox("Selecciona el equipo", equipos)
-    
-    # Subida de archivo
-    uploaded_file = st.file_uploader("Selecciona un archivo Excel", type=["xlsx", "xls"])
-    
-    if uploaded_file is not None:
-        st.write("Archivo subido:", uploaded_file.name)
-        if st.button("Guardar Archivo"):
-            file_path, message = guardar_archivo(uploaded_file, equipo_seleccionado)
-            st.success(message)
+        equipo_seleccionado = st.selectbox("Selecciona el equipo", EQUIPOS)
+    
+    # Subida de archivos (varios Excel o un .zip con toda una temporada)
+    uploaded_files = st.file_uploader(
+        "Selecciona uno o varios archivos Excel, o un .zip",
+        type=["xlsx", "xls", "zip"],
+        accept_multiple_files=True
+    )
+    
+    if uploaded_files:
+        st.write("Archivos subidos:", ", ".join(archivo.name for archivo in uploaded_files))
+        if st.button("Guardar Archivos"):
+            guardar_archivos(uploaded_files, equipo_seleccionado)
             
     # Asegurarse de que tenemos la lista de archivos
     if "archivos_subidos" not in st.session_state:
@@ -186,6 +244,12 @@ def pagina_subir_archivo():
         if archivo_a_eliminar:
             try:
                 os.remove(archivo_a_eliminar['ruta'])
+                eliminar_derivados(archivo_a_eliminar['ruta'])
+                eliminar_artefactos(archivo_a_eliminar['ruta'])
+                eliminar_graficos(archivo_a_eliminar['ruta'])
+                agregados.quitar_partido(archivo_a_eliminar['id'])
+                indice_jugadores.quitar_partido(archivo_a_eliminar['id'])
+                catalogo.eliminar_archivo(archivo_a_eliminar['id'])
                 st.success(f"Archivo {archivo_a_eliminar['nombre_original']} eliminado correctamente.")
             except Exception as e:
                 st.error(f"Error al eliminar el archivo: {str(e)}")
@@ -246,7 +310,7 @@ def pagina_subir_archivo():
 def pagina_graficos_partido():
     st.title("Gráficos del Partido")
     
-    # Asegurarse de que tenemos la lista de archivos actualizada
+    # Asegurarse de que tenemos la lista de archivos actualizada (consulta al catálogo)
     st.session_state.archivos_subidos = escanear_archivos()
     
     # Determinar qué archivos mostrar según el usuario
@@ -284,29 +348,12 @@ def pagina_graficos_partido():
         
         # Cargar el archivo Excel
         try:
-            df = pd.read_excel(ruta_archivo)
+            df = cargar_partido(ruta_archivo)
             st.success(f"Archivo {archivo_seleccionado} cargado correctamente")
             
-            # Visualizaciones en pestañas
-            tabs = st.tabs(["Red de Pases", "Matriz de Pases", "Faltas", "Tiros", "Recuperaciones", "Pases Específicos"])
-            
-            with tabs[0]:
-                graficos.red_de_pases(df)
-            
-            with tabs[1]:
-                graficos.matriz_de_pases(df)
-            
-            with tabs[2]:
-                graficos.faltas_valencia(df)
-            
-            with tabs[3]:
-                graficos.tiros_valencia(df)
-            
-            with tabs[4]:
-                graficos.recuperaciones_valencia(df)
-                
-            with tabs[5]:
-                graficos.pases_especificos(df)
+            # Solo se calcula la vista seleccionada; el resto se prerenderiza en segundo plano
+            vista = st.radio("Gráfico", list(graficos.VISTAS_GRAFICOS), horizontal=True, key="vista_graficos")
+            graficos.mostrar_vista(df, vista)
             
             # Agregar botón para exportar todos los gráficos en un solo PDF
             st.markdown("---")